@@ -257,7 +257,7 @@ def register_tools(mcp: FastMCP) -> None:
             """Analyze the feasibility and risks of a specific PR recommendation."""
             await ctx.info("Analyzing PR feasibility")
             try:
-                return await mcp.feasibility_analyzer.analyze_feasibility(  # type: ignore[no-any-return]
+                return mcp.feasibility_analyzer.analyze_feasibility(  # type: ignore[no-any-return]
                     pr_recommendation
                 )
             except Exception as e:
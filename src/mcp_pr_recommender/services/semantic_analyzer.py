@@ -1,6 +1,7 @@
 """Enhanced semantic analyzer that handles all grouping logic."""
 import json
 import logging
+import re
 
 import openai
 from mcp_shared_lib.models import FileStatus, OutstandingChangesAnalysis
@@ -13,6 +14,22 @@ from mcp_pr_recommender.prompts import get_enhanced_grouping_system_prompt
 class SemanticAnalyzer:
     """LLM-powered analyzer that handles all file grouping and PR generation."""
 
+    # Cache/generated artifacts that shouldn't be in PRs. Compiled once at
+    # class creation so each path check is a single regex scan rather than a
+    # Python-level substring loop over the patterns.
+    _EXCLUDE_PATTERNS = (
+        "__pycache__",
+        ".pyc",
+        ".pyo",
+        ".history/",
+        ".git/",
+        "node_modules/",
+        ".ds_store",
+        "thumbs.db",
+        ".pytest_cache/",
+    )
+    _EXCLUSION_RE = re.compile("|".join(map(re.escape, _EXCLUDE_PATTERNS)))
+
     def __init__(self) -> None:
         """Initialize semantic analyzer with OpenAI client."""
         self.client = openai.AsyncOpenAI(api_key=settings().openai_api_key)
@@ -60,21 +77,7 @@ class SemanticAnalyzer:
 
     def _should_exclude_file(self, path: str) -> bool:
         """Files that shouldn't be in PRs."""
-        path_lower = path.lower()
-
-        exclude_patterns = [
-            "__pycache__",
-            ".pyc",
-            ".pyo",
-            ".history/",
-            ".git/",
-            "node_modules/",
-            ".ds_store",
-            "thumbs.db",
-            ".pytest_cache/",
-        ]
-
-        return any(pattern in path_lower for pattern in exclude_patterns)
+        return self._EXCLUSION_RE.search(path.lower()) is not None
 
     async def _llm_group_files(
         self, files: list[FileStatus], analysis: OutstandingChangesAnalysis
@@ -1,19 +1,72 @@
 """PR feasibility analysis tool."""
 import logging
+import re
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
-from mcp_pr_recommender.config import settings
+from mcp_pr_recommender.config import get_settings
+
+# Canonical risk codes returned in `risk_codes` next to the
+# human-readable `risk_factors`; callers and tests should check these
+# instead of matching wording.
+RISK_LARGE_FILE_COUNT = "LARGE_FILE_COUNT"
+RISK_MIXED_FILE_TYPES = "MIXED_FILE_TYPES"
+RISK_CRITICAL_FILES = "CRITICAL_FILES"
+RISK_LARGE_CHANGES = "LARGE_CHANGES"
+
+
+@dataclass(frozen=True)
+class _FileScan:
+    """Everything the feasibility helpers need, gathered in one pass."""
+
+    file_types: frozenset[str]
+    directories: frozenset[str]
+    extensions: frozenset[str]
+    suffixes: frozenset[str]
+    has_migration: bool
+    has_model: bool
+    has_test: bool
+    has_config: bool
+    critical_count: int
+    potentially_large_count: int
 
 
 class FeasibilityAnalyzerTool:
     """Tool for analyzing PR feasibility and risks."""
 
-    def __init__(self) -> None:
-        """Initialize feasibility analyzer tool with logging."""
+    # Suffix-to-category dispatch table, built once at class creation; one
+    # dict lookup per file replaces three list-membership scans.
+    _SUFFIX_CATEGORY: ClassVar[dict[str, str]] = {
+        **dict.fromkeys((".py", ".js", ".ts", ".java", ".cpp", ".c"), "source"),
+        **dict.fromkeys((".md", ".rst", ".txt"), "docs"),
+        **dict.fromkeys((".json", ".yaml", ".yml", ".toml", ".ini"), "config"),
+    }
+
+    # All critical substrings matched in one scan of the path instead of
+    # one `in` probe per pattern.
+    _CRITICAL_RE: ClassVar[re.Pattern[str]] = re.compile(
+        "migration|schema|config|env|docker|deploy"
+    )
+
+    # Suffix groups checked with a single str.endswith call each.
+    _CONFIG_SUFFIXES: ClassVar[tuple[str, ...]] = (".json", ".yaml", ".yml", ".toml")
+    _CHECKLIST_CONFIG_SUFFIXES: ClassVar[tuple[str, ...]] = (".json", ".yaml", ".yml")
+    _LARGE_SUFFIXES: ClassVar[tuple[str, ...]] = (".sql", ".json", ".lock")
+
+    def __init__(self, settings: Any | None = None) -> None:
+        """Initialize feasibility analyzer tool with logging.
+
+        Args:
+            settings: Optional settings object; defaults to the shared
+                application settings. Tests can pass a stub instead of
+                patching the module.
+        """
         self.logger = logging.getLogger(__name__)
+        self._settings = settings if settings is not None else get_settings()
 
-    async def analyze_feasibility(
+    def analyze_feasibility(
         self,
         pr_recommendation: dict[str, Any],
     ) -> dict[str, Any]:
@@ -28,12 +81,33 @@ class FeasibilityAnalyzerTool:
         self.logger.info("Analyzing PR feasibility")
 
         try:
-            files = pr_recommendation.get("files", [])
+            # Tuples are hashable, so the shared file scan can memoize on them
+            files = tuple(pr_recommendation.get("files", []))
+
+            # A PR at more than twice the file limit is infeasible no
+            # matter what the detailed scans would say, so reject it
+            # without paying for them.
+            if len(files) > self._settings.max_files_per_pr * 2:
+                return {
+                    "feasible": False,
+                    "risk_factors": [f"Large number of files ({len(files)})"],
+                    "risk_codes": {RISK_LARGE_FILE_COUNT},
+                    "recommendations": ["Consider splitting into smaller PRs"],
+                    "estimated_effort": pr_recommendation.get(
+                        "estimated_review_time", 0
+                    ),
+                    "complexity_breakdown": {"file_count": len(files)},
+                    "dependency_analysis": {},
+                    "review_checklist": self._generate_review_checklist(
+                        pr_recommendation
+                    ),
+                }
 
             # Analyze various aspects
             analysis = {
                 "feasible": True,
                 "risk_factors": [],
+                "risk_codes": set(),
                 "recommendations": [],
                 "estimated_effort": pr_recommendation.get("estimated_review_time", 0),
                 "complexity_breakdown": self._analyze_complexity(files),
@@ -42,8 +116,9 @@ class FeasibilityAnalyzerTool:
             }
 
             # Check file count
-            if len(files) > settings().max_files_per_pr:
+            if len(files) > self._settings.max_files_per_pr:
                 analysis["risk_factors"].append(f"Large number of files ({len(files)})")
+                analysis["risk_codes"].add(RISK_LARGE_FILE_COUNT)
                 analysis["recommendations"].append(
                     "Consider splitting into smaller PRs"
                 )
@@ -52,11 +127,13 @@ class FeasibilityAnalyzerTool:
             file_analysis = self._categorize_files(files)
             if len(file_analysis["file_types"]) > 2:
                 analysis["risk_factors"].append("Mixed file types")
+                analysis["risk_codes"].add(RISK_MIXED_FILE_TYPES)
                 analysis["recommendations"].append("Consider separating by file type")
 
             # Check for high-risk patterns
             risk_patterns = self._check_risk_patterns(files)
             analysis["risk_factors"].extend(risk_patterns["factors"])
+            analysis["risk_codes"].update(risk_patterns["codes"])
             analysis["recommendations"].extend(risk_patterns["recommendations"])
 
             # Overall feasibility
@@ -73,112 +150,140 @@ class FeasibilityAnalyzerTool:
             self.logger.error(f"Feasibility analysis failed: {str(e)}")
             return {"error": f"Feasibility analysis failed: {str(e)}"}
 
-    def _categorize_files(self, files: list[str]) -> dict[str, Any]:
-        """Categorize files by type and directory."""
-        file_types = set()
-        directories = set()
-        extensions = set()
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _scan_files(files: tuple[str, ...]) -> _FileScan:
+        """Walk the file list once and collect every signal the helpers need.
+
+        Pure function of the file tuple; repeat calls for the same PR hit
+        the cache instead of re-scanning.
+        """
+        file_types: set[str] = set()
+        directories: set[str] = set()
+        extensions: set[str] = set()
+        suffixes: set[str] = set()
+        has_migration = has_model = has_test = has_config = False
+        critical_count = 0
+        potentially_large_count = 0
 
         for file_path in files:
             path = Path(file_path)
+            suffix = path.suffix
+            lowered = file_path.lower()
+
+            suffixes.add(suffix)
+            if suffix:
+                extensions.add(suffix)
+
+            category = FeasibilityAnalyzerTool._SUFFIX_CATEGORY.get(suffix)
+            if category is None:
+                category = "test" if "test" in lowered else "other"
+            file_types.add(category)
 
-            # Categorize by extension
-            if path.suffix:
-                extensions.add(path.suffix)
-
-            # Categorize by type
-            if path.suffix in [".py", ".js", ".ts", ".java", ".cpp", ".c"]:
-                file_types.add("source")
-            elif path.suffix in [".md", ".rst", ".txt"]:
-                file_types.add("docs")
-            elif path.suffix in [".json", ".yaml", ".yml", ".toml", ".ini"]:
-                file_types.add("config")
-            elif "test" in str(path).lower():
-                file_types.add("test")
-            else:
-                file_types.add("other")
-
-            # Track directories
             directories.add(str(path.parent))
 
+            has_migration |= "migration" in lowered
+            has_model |= "model" in lowered
+            has_test |= "test" in lowered
+            has_config |= file_path.endswith(FeasibilityAnalyzerTool._CONFIG_SUFFIXES)
+
+            if FeasibilityAnalyzerTool._CRITICAL_RE.search(lowered):
+                critical_count += 1
+            if file_path.endswith(FeasibilityAnalyzerTool._LARGE_SUFFIXES):
+                potentially_large_count += 1
+
+        return _FileScan(
+            file_types=frozenset(file_types),
+            directories=frozenset(directories),
+            extensions=frozenset(extensions),
+            suffixes=frozenset(suffixes),
+            has_migration=has_migration,
+            has_model=has_model,
+            has_test=has_test,
+            has_config=has_config,
+            critical_count=critical_count,
+            potentially_large_count=potentially_large_count,
+        )
+
+    @staticmethod
+    def _categorize_files(files: tuple[str, ...]) -> dict[str, Any]:
+        """Categorize files by type and directory."""
+        scan = FeasibilityAnalyzerTool._scan_files(files)
         return {
-            "file_types": list(file_types),
-            "directories": list(directories),
-            "extensions": list(extensions),
-            "directory_count": len(directories),
-            "type_diversity": len(file_types),
+            "file_types": list(scan.file_types),
+            "directories": list(scan.directories),
+            "extensions": list(scan.extensions),
+            "directory_count": len(scan.directories),
+            "type_diversity": len(scan.file_types),
         }
 
-    def _analyze_complexity(self, files: list[str]) -> dict[str, Any]:
+    @staticmethod
+    def _analyze_complexity(files: tuple[str, ...]) -> dict[str, Any]:
         """Analyze complexity factors."""
+        scan = FeasibilityAnalyzerTool._scan_files(files)
         return {
             "file_count": len(files),
             "estimated_review_time_per_file": 10,  # minutes
             "complexity_factors": [
                 "File count" if len(files) > 5 else None,
-                "Multiple directories"
-                if len({Path(f).parent for f in files}) > 2
-                else None,
-                "Mixed file types"
-                if len({Path(f).suffix for f in files}) > 3
-                else None,
+                "Multiple directories" if len(scan.directories) > 2 else None,
+                "Mixed file types" if len(scan.suffixes) > 3 else None,
             ],
-            "complexity_score": min(
-                10, len(files) + len({Path(f).parent for f in files})
-            ),
+            "complexity_score": min(10, len(files) + len(scan.directories)),
         }
 
-    def _analyze_dependencies(self, files: list[str]) -> dict[str, Any]:
+    @staticmethod
+    def _analyze_dependencies(files: tuple[str, ...]) -> dict[str, Any]:
         """Analyze file dependencies."""
-        # Simple dependency analysis based on file patterns
-        has_migration = any("migration" in f.lower() for f in files)
-        has_model = any("model" in f.lower() for f in files)
-        has_test = any("test" in f.lower() for f in files)
-        has_config = any(f.endswith((".json", ".yaml", ".yml", ".toml")) for f in files)
-
+        scan = FeasibilityAnalyzerTool._scan_files(files)
         return {
-            "has_migration": has_migration,
-            "has_model": has_model,
-            "has_test": has_test,
-            "has_config": has_config,
+            "has_migration": scan.has_migration,
+            "has_model": scan.has_model,
+            "has_test": scan.has_test,
+            "has_config": scan.has_config,
             "dependency_concerns": [
-                "Migration with model changes" if has_migration and has_model else None,
-                "Config changes without tests" if has_config and not has_test else None,
-                "Model changes without tests" if has_model and not has_test else None,
+                "Migration with model changes"
+                if scan.has_migration and scan.has_model
+                else None,
+                "Config changes without tests"
+                if scan.has_config and not scan.has_test
+                else None,
+                "Model changes without tests"
+                if scan.has_model and not scan.has_test
+                else None,
             ],
         }
 
-    def _check_risk_patterns(self, files: list[str]) -> dict[str, Any]:
+    def _check_risk_patterns(self, files: tuple[str, ...]) -> dict[str, Any]:
         """Check for high-risk file patterns."""
+        scan = self._scan_files(tuple(files))
         risk_factors = []
+        codes = []
         recommendations = []
 
-        # Check for critical file patterns
-        critical_patterns = ["migration", "schema", "config", "env", "docker", "deploy"]
-
-        critical_files = [
-            f
-            for f in files
-            if any(pattern in f.lower() for pattern in critical_patterns)
-        ]
-
-        if critical_files:
-            risk_factors.append(f"Critical files present: {len(critical_files)}")
+        if scan.critical_count:
+            risk_factors.append(f"Critical files present: {scan.critical_count}")
+            codes.append(RISK_CRITICAL_FILES)
             recommendations.append("Extra review needed for critical files")
 
-        # Check for large file changes (would need line count data)
-        # For now, just flag certain file types as potentially large
-        potentially_large = [f for f in files if f.endswith((".sql", ".json", ".lock"))]
-
-        if potentially_large:
+        # Certain file types tend to carry large changes (no line count data here)
+        if scan.potentially_large_count:
             risk_factors.append("Files that might contain large changes")
+            codes.append(RISK_LARGE_CHANGES)
             recommendations.append("Verify file sizes are reasonable")
 
         return {
-            "factors": [f for f in risk_factors if f],
-            "recommendations": [r for r in recommendations if r],
+            "factors": risk_factors,
+            "codes": codes,
+            "recommendations": recommendations,
         }
 
+    # Bit flags for the single-pass checklist scan.
+    _HAS_TEST: ClassVar[int] = 1
+    _HAS_CONFIG: ClassVar[int] = 2
+    _HAS_MIGRATION: ClassVar[int] = 4
+    _ALL_FLAGS: ClassVar[int] = _HAS_TEST | _HAS_CONFIG | _HAS_MIGRATION
+
     def _generate_review_checklist(
         self, pr_recommendation: dict[str, Any]
     ) -> list[str]:
@@ -190,16 +295,27 @@ class FeasibilityAnalyzerTool:
             "No sensitive information is exposed",
         ]
 
-        # Add specific checks based on PR content
+        # Collect content flags in one pass instead of one any() scan each
         files = pr_recommendation.get("files", [])
-
-        if any("test" in f.lower() for f in files):
+        flags = 0
+        for file_path in files:
+            lowered = file_path.lower()
+            if "test" in lowered:
+                flags |= self._HAS_TEST
+            if file_path.endswith(self._CHECKLIST_CONFIG_SUFFIXES):
+                flags |= self._HAS_CONFIG
+            if "migration" in lowered:
+                flags |= self._HAS_MIGRATION
+            if flags == self._ALL_FLAGS:
+                break
+
+        if flags & self._HAS_TEST:
             checklist.append("Test coverage is adequate")
 
-        if any(f.endswith((".json", ".yaml", ".yml")) for f in files):
+        if flags & self._HAS_CONFIG:
             checklist.append("Configuration changes are validated")
 
-        if any("migration" in f.lower() for f in files):
+        if flags & self._HAS_MIGRATION:
             checklist.append("Database migration is reversible")
             checklist.append("Migration has been tested on staging")
 
@@ -0,0 +1,312 @@
+"""Integration test fixtures for mcp_pr_recommender.
+
+Service-level mocks live here rather than in the top-level conftest so that
+pytest only considers them when collecting integration tests.
+"""
+
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from tests.utils.factories import FileChangeFactory
+
+
+@pytest.fixture
+def mock_pr_grouper():
+    """Mock PR grouper service for testing."""
+    grouper = Mock()
+
+    # Main grouping method
+    grouper.group_files.return_value = [
+        {
+            "group_id": "auth_features",
+            "files": ["src/auth/login.py", "src/auth/logout.py", "tests/test_auth.py"],
+            "description": "Authentication feature updates",
+            "cohesion_score": 0.85,
+            "estimated_size": "medium",
+            "risk_level": "medium",
+        },
+        {
+            "group_id": "user_model",
+            "files": [
+                "src/models/user.py",
+                "src/models/profile.py",
+                "tests/test_user_model.py",
+            ],
+            "description": "User model enhancements",
+            "cohesion_score": 0.92,
+            "estimated_size": "small",
+            "risk_level": "low",
+        },
+        {
+            "group_id": "config_updates",
+            "files": ["config/database.json", "config/auth.yaml"],
+            "description": "Configuration updates",
+            "cohesion_score": 0.78,
+            "estimated_size": "small",
+            "risk_level": "high",
+        },
+    ]
+
+    # Similarity analysis
+    grouper.calculate_file_similarity.return_value = 0.8
+    grouper.analyze_change_patterns.return_value = {
+        "dominant_pattern": "feature_addition",
+        "pattern_confidence": 0.85,
+        "suggested_grouping": "by_feature",
+    }
+
+    # Group optimization
+    grouper.optimize_groups.return_value = {
+        "optimized": True,
+        "changes_made": 2,
+        "final_score": 0.87,
+        "improvements": ["Moved test files to feature groups", "Balanced group sizes"],
+    }
+
+    return grouper
+
+
+@pytest.fixture
+def mock_recommendation_engine():
+    """Mock recommendation engine for testing."""
+    engine = Mock()
+
+    # Generate recommendations
+    engine.generate_recommendations.return_value = [
+        {
+            "id": "pr_001",
+            "title": "Add user authentication system",
+            "description": "Implement comprehensive user authentication with login, logout, and session management.",
+            "files": [
+                "src/auth/login.py",
+                "src/auth/logout.py",
+                "src/auth/session.py",
+                "tests/test_auth.py",
+            ],
+            "estimated_size": "large",
+            "priority": "high",
+            "risk_level": "medium",
+            "confidence": 0.92,
+            "labels": ["feature", "authentication", "security"],
+            "reviewers": ["senior-dev", "security-team"],
+            "estimated_review_time": "2-3 hours",
+        },
+        {
+            "id": "pr_002",
+            "title": "Update user and profile models",
+            "description": "Enhance user model with new fields and improve profile management.",
+            "files": [
+                "src/models/user.py",
+                "src/models/profile.py",
+                "tests/test_user_model.py",
+                "migrations/0002_user_updates.py",
+            ],
+            "estimated_size": "medium",
+            "priority": "medium",
+            "risk_level": "low",
+            "confidence": 0.88,
+            "labels": ["enhancement", "models"],
+            "reviewers": ["backend-team"],
+            "estimated_review_time": "1-2 hours",
+        },
+        {
+            "id": "pr_003",
+            "title": "Critical configuration updates",
+            "description": "Update database and authentication configuration for production deployment.",
+            "files": ["config/database.json", "config/auth.yaml", "docs/deployment.md"],
+            "estimated_size": "small",
+            "priority": "critical",
+            "risk_level": "high",
+            "confidence": 0.95,
+            "labels": ["config", "deployment", "critical"],
+            "reviewers": ["devops-team", "senior-dev"],
+            "estimated_review_time": "30-60 minutes",
+        },
+    ]
+
+    # Scoring and ranking
+    engine.score_recommendation.return_value = {
+        "overall_score": 0.85,
+        "factors": {
+            "cohesion": 0.9,
+            "size_appropriateness": 0.8,
+            "risk_balance": 0.85,
+            "review_efficiency": 0.88,
+        },
+    }
+
+    engine.rank_recommendations.return_value = [
+        {"id": "pr_003", "rank": 1, "score": 0.95},
+        {"id": "pr_001", "rank": 2, "score": 0.92},
+        {"id": "pr_002", "rank": 3, "score": 0.88},
+    ]
+
+    # Optimization suggestions
+    engine.suggest_optimizations.return_value = {
+        "suggestions": [
+            "Consider splitting large PR into smaller ones",
+            "Add more test coverage for new features",
+            "Include documentation updates",
+        ],
+        "confidence": 0.8,
+    }
+
+    return engine
+
+
+@pytest.fixture
+def mock_file_similarity_analyzer():
+    """Mock file similarity analyzer."""
+    analyzer = Mock()
+
+    # Calculate similarity between files
+    def mock_similarity(file1, file2):
+        # Mock some realistic similarities
+        similarity_map = {
+            ("src/auth/login.py", "src/auth/logout.py"): 0.85,
+            ("src/auth/login.py", "tests/test_auth.py"): 0.7,
+            ("src/models/user.py", "src/models/profile.py"): 0.9,
+            ("config/database.json", "config/auth.yaml"): 0.6,
+        }
+        key = (file1, file2) if file1 < file2 else (file2, file1)
+        return similarity_map.get(key, 0.3)
+
+    analyzer.calculate_similarity.side_effect = mock_similarity
+
+    # Semantic categorization
+    analyzer.categorize_file.return_value = {
+        "category": "authentication",
+        "subcategory": "core_logic",
+        "confidence": 0.9,
+    }
+
+    # Dependency analysis
+    analyzer.analyze_dependencies.return_value = {
+        "imports": ["os", "json", "typing"],
+        "internal_deps": ["src.models.user", "src.utils.crypto"],
+        "dependency_score": 0.8,
+    }
+
+    return analyzer
+
+
+@pytest.fixture
+def mock_pr_template_generator():
+    """Mock PR template generator."""
+    generator = Mock()
+
+    generator.generate_title.return_value = "Add user authentication system"
+    generator.generate_description.return_value = """
+## Summary
+This PR implements a comprehensive user authentication system including:
+- Login/logout functionality
+- Session management
+- User model updates
+- Comprehensive test coverage
+
+## Changes
+- Added `src/auth/login.py` - Core login logic
+- Added `src/auth/logout.py` - Logout functionality
+- Modified `src/models/user.py` - User model enhancements
+- Added `tests/test_auth.py` - Authentication tests
+
+## Testing
+- All existing tests pass
+- New authentication tests added
+- Manual testing completed
+
+## Risk Assessment
+- Medium risk due to new authentication logic
+- Comprehensive test coverage mitigates risk
+- No breaking changes to existing API
+    """.strip()
+
+    generator.suggest_labels.return_value = ["feature", "authentication", "backend"]
+    generator.suggest_reviewers.return_value = ["backend-team", "security-reviewer"]
+
+    return generator
+
+
+@pytest.fixture
+def mock_analyzer_client():
+    """Mock analyzer client for testing integration."""
+    client = Mock()
+
+    # Mock analyzer responses
+    client.analyze_repository.return_value = {
+        "status": "success",
+        "timestamp": datetime.now(),
+        "changes": {
+            "modified": ["src/auth.py", "src/user.py"],
+            "untracked": ["src/new_feature.py"],
+            "staged": ["tests/test_auth.py"],
+        },
+        "risk_assessment": {"overall_risk": 0.5, "high_risk_files": ["src/auth.py"]},
+        "file_analysis": [
+            {
+                "file_path": "src/auth.py",
+                "change_type": "modified",
+                "risk_score": 0.8,
+                "complexity": 12,
+                "semantic_category": "authentication",
+            },
+            {
+                "file_path": "src/user.py",
+                "change_type": "modified",
+                "risk_score": 0.4,
+                "complexity": 6,
+                "semantic_category": "models",
+            },
+        ],
+    }
+
+    client.get_detailed_changes.return_value = [
+        FileChangeFactory.create(
+            file_path="src/auth.py", change_type="modified", risk_score=0.8
+        ),
+        FileChangeFactory.create(
+            file_path="src/user.py", change_type="modified", risk_score=0.4
+        ),
+    ]
+
+    return client
+
+
+@pytest.fixture
+def mock_semantic_analyzer():
+    """Mock semantic analyzer for understanding file content."""
+    analyzer = Mock()
+
+    # Semantic similarity
+    def mock_semantic_similarity(content1, content2):
+        # Mock realistic semantic similarities
+        if "auth" in content1.lower() and "auth" in content2.lower():
+            return 0.9
+        elif "model" in content1.lower() and "model" in content2.lower():
+            return 0.85
+        elif "test" in content1.lower() and "test" in content2.lower():
+            return 0.7
+        else:
+            return 0.3
+
+    analyzer.calculate_semantic_similarity.side_effect = mock_semantic_similarity
+
+    # Content categorization
+    analyzer.categorize_content.return_value = {
+        "primary_category": "business_logic",
+        "secondary_categories": ["authentication", "validation"],
+        "confidence": 0.85,
+        "keywords": ["login", "user", "session", "validate"],
+    }
+
+    # Impact analysis
+    analyzer.analyze_impact.return_value = {
+        "scope": "module",
+        "affected_components": ["auth_service", "user_controller"],
+        "breaking_changes": False,
+        "api_changes": True,
+    }
+
+    return analyzer
@@ -1,7 +1,6 @@
 """Comprehensive unit tests for the AtomicityValidator service."""
 
-from pathlib import Path
-from unittest.mock import Mock, patch
+from types import SimpleNamespace
 
 import pytest
 from mcp_shared_lib.models.git.changes import FileStatus
@@ -10,45 +9,177 @@ from mcp_pr_recommender.models.pr.recommendations import ChangeGroup
 from mcp_pr_recommender.services.atomicity_validator import AtomicityValidator
 
 
+def _fs(
+    *,
+    path: str,
+    status_code: str = "M",
+    lines_added: int = 0,
+    lines_deleted: int = 0,
+) -> FileStatus:
+    """Build a FileStatus via model_construct, skipping pydantic validation.
+
+    Test inputs here are trusted literals, so bypassing validators keeps
+    bulk fixture construction cheap.
+    """
+    return FileStatus.model_construct(
+        path=path,
+        status_code=status_code,
+        lines_added=lines_added,
+        lines_deleted=lines_deleted,
+    )
+
+
+# Shared settings stub, installed once per session by ``_patch_settings`` so
+# individual tests don't pay unittest.mock.patch enter/exit costs.
+_SETTINGS_STUB = SimpleNamespace(max_files_per_pr=8)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _patch_settings():
+    """Point the validator's settings accessor at the shared stub."""
+    mp = pytest.MonkeyPatch()
+    mp.setattr(
+        "mcp_pr_recommender.services.atomicity_validator.settings",
+        lambda: _SETTINGS_STUB,
+    )
+    yield
+    mp.undo()
+
+
+# Read-only file lists shared by the fixtures below. Building them once at
+# import time avoids re-running pydantic validation for every test.
+_SAMPLE_FILES = [
+    _fs(path="src/main.py", status_code="M", lines_added=10, lines_deleted=5),
+    _fs(path="src/utils.py", status_code="M", lines_added=20, lines_deleted=10),
+    _fs(path="tests/test_main.py", status_code="A", lines_added=50, lines_deleted=0),
+]
+
+_MIXED_CONCERN_FILES = [
+    _fs(path="src/main.py", status_code="M"),
+    _fs(path="config.json", status_code="M"),
+    _fs(path="docs/README.md", status_code="M"),
+]
+
+
+MIXED_CONCERN_CASES = [
+    pytest.param(
+        [
+            _fs(path="src/app.py", status_code="M"),
+            _fs(path="config.yaml", status_code="M"),
+        ],
+        "mixed",
+        True,
+        id="source_and_config",
+    ),
+    pytest.param(
+        [
+            _fs(path="src/app.py", status_code="M"),
+            _fs(path="README.md", status_code="M"),
+        ],
+        "mixed",
+        True,
+        id="docs_and_source",
+    ),
+    pytest.param(
+        [_fs(path=f"dir{i}/file.py", status_code="M") for i in range(1, 5)],
+        "source",
+        True,
+        id="many_directories",
+    ),
+    pytest.param(
+        [
+            _fs(path="src/app.py", status_code="M"),
+            _fs(path="src/utils.py", status_code="M"),
+        ],
+        "source",
+        False,
+        id="same_type",
+    ),
+    pytest.param(
+        [
+            _fs(path="tests/test_app.py", status_code="M"),
+            _fs(path="tests/test_utils.py", status_code="M"),
+        ],
+        "test",
+        False,
+        id="test_files",
+    ),
+    pytest.param(
+        [
+            _fs(path="config.json", status_code="M"),
+            _fs(path="settings.yaml", status_code="M"),
+            _fs(path="app.toml", status_code="M"),
+        ],
+        "config",
+        False,
+        id="config_extensions",
+    ),
+    pytest.param(
+        [
+            _fs(path="README.md", status_code="M"),
+            _fs(path="docs/guide.rst", status_code="M"),
+            _fs(path="CHANGELOG.txt", status_code="M"),
+        ],
+        "docs",
+        False,
+        id="doc_extensions",
+    ),
+]
+
+CIRCULAR_DEPENDENCY_CASES = [
+    pytest.param(
+        [
+            _fs(path="migrations/001_add_user.py", status_code="A"),
+            _fs(path="models/user.py", status_code="M"),
+        ],
+        "database",
+        id="migration_and_model",
+    ),
+    pytest.param(
+        [
+            _fs(path="schema/user_schema.py", status_code="M"),
+            _fs(path="api/user_controller.py", status_code="M"),
+        ],
+        "api",
+        id="schema_and_api",
+    ),
+    pytest.param(
+        [
+            _fs(path="src/utils.py", status_code="M"),
+            _fs(path="src/helpers.py", status_code="M"),
+        ],
+        "source",
+        id="no_dependencies",
+    ),
+]
+
+
 @pytest.mark.unit
 class TestAtomicityValidator:
     """Test the AtomicityValidator service."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def validator(self):
         """Create atomicity validator instance."""
         return AtomicityValidator()
 
     @pytest.fixture
-    def mock_settings(self):
-        """Mock settings for testing."""
-        with patch(
-            "mcp_pr_recommender.services.atomicity_validator.settings"
-        ) as mock_settings_func:
-            mock_settings_instance = Mock()
-            mock_settings_instance.max_files_per_pr = 8
-            mock_settings_func.return_value = mock_settings_instance
-            yield mock_settings_instance
+    def mock_settings(self, request):
+        """Expose the shared settings stub, restoring defaults afterwards.
 
-    @pytest.fixture
+        Tests needing a non-default max_files_per_pr parametrize this
+        fixture indirectly instead of mutating the stub inline.
+        """
+        _SETTINGS_STUB.max_files_per_pr = getattr(request, "param", 8)
+        yield _SETTINGS_STUB
+        _SETTINGS_STUB.max_files_per_pr = 8
+
+    @pytest.fixture(scope="class")
     def sample_files(self):
-        """Create sample file status objects."""
-        return [
-            FileStatus(
-                path="src/main.py", status_code="M", lines_added=10, lines_deleted=5
-            ),
-            FileStatus(
-                path="src/utils.py", status_code="M", lines_added=20, lines_deleted=10
-            ),
-            FileStatus(
-                path="tests/test_main.py",
-                status_code="A",
-                lines_added=50,
-                lines_deleted=0,
-            ),
-        ]
+        """Provide the shared sample file status objects."""
+        return _SAMPLE_FILES
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def atomic_group(self, sample_files):
         """Create an atomic change group."""
         return ChangeGroup(
@@ -60,35 +191,12 @@ class TestAtomicityValidator:
             semantic_similarity=0.85,
         )
 
-    @pytest.fixture
-    def large_group(self):
-        """Create a group with too many files."""
-        files = [
-            FileStatus(
-                path=f"src/file_{i}.py", status_code="M", lines_added=5, lines_deleted=2
-            )
-            for i in range(12)  # More than max_files_per_pr
-        ]
-        return ChangeGroup(
-            id="large_group",
-            files=files,
-            category="source",
-            confidence=0.8,
-            reasoning="Large feature implementation",
-            semantic_similarity=0.7,
-        )
-
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def mixed_concerns_group(self):
         """Create a group with mixed concerns."""
-        files = [
-            FileStatus(path="src/main.py", status_code="M"),
-            FileStatus(path="config.json", status_code="M"),
-            FileStatus(path="docs/README.md", status_code="M"),
-        ]
         return ChangeGroup(
             id="mixed_group",
-            files=files,
+            files=_MIXED_CONCERN_FILES,
             category="mixed",
             confidence=0.75,
             reasoning="Mixed changes",
@@ -150,7 +258,7 @@ class TestAtomicityValidator:
     def test_is_atomic_too_many_changes(self, validator, mock_settings):
         """Test atomic check fails for too many line changes."""
         files = [
-            FileStatus(
+            _fs(
                 path="huge_file.py", status_code="M", lines_added=800, lines_deleted=500
             )
         ]
@@ -174,8 +282,8 @@ class TestAtomicityValidator:
     def test_is_atomic_with_circular_dependencies(self, validator, mock_settings):
         """Test atomic check with circular dependencies (currently always returns True for deps)."""
         files = [
-            FileStatus(path="db/migration_001.sql", status_code="A"),
-            FileStatus(path="models/user.py", status_code="M"),
+            _fs(path="db/migration_001.sql", status_code="A"),
+            _fs(path="models/user.py", status_code="M"),
         ]
         group = ChangeGroup(
             id="deps_group",
@@ -189,139 +297,27 @@ class TestAtomicityValidator:
         # Currently, circular dependency check returns False (doesn't fail atomicity)
         assert validator._is_atomic(group) is True
 
-    def test_has_mixed_concerns_source_and_config(self, validator):
-        """Test mixed concerns detection for source and config."""
-        files = [
-            FileStatus(path="src/app.py", status_code="M"),
-            FileStatus(path="config.yaml", status_code="M"),
-        ]
-        group = ChangeGroup(
-            id="test",
-            files=files,
-            category="mixed",
-            confidence=0.8,
-            reasoning="Test",
-            semantic_similarity=0.7,
-        )
-
-        assert validator._has_mixed_concerns(group) is True
-
-    def test_has_mixed_concerns_docs_and_source(self, validator):
-        """Test mixed concerns detection for docs and source."""
-        files = [
-            FileStatus(path="src/app.py", status_code="M"),
-            FileStatus(path="README.md", status_code="M"),
-        ]
-        group = ChangeGroup(
-            id="test",
-            files=files,
-            category="mixed",
-            confidence=0.8,
-            reasoning="Test",
-            semantic_similarity=0.7,
-        )
-
-        assert validator._has_mixed_concerns(group) is True
-
-    def test_has_mixed_concerns_many_directories(self, validator):
-        """Test mixed concerns detection for too many directories."""
-        files = [
-            FileStatus(path="dir1/file.py", status_code="M"),
-            FileStatus(path="dir2/file.py", status_code="M"),
-            FileStatus(path="dir3/file.py", status_code="M"),
-            FileStatus(path="dir4/file.py", status_code="M"),
-        ]
-        group = ChangeGroup(
-            id="test",
-            files=files,
-            category="source",
-            confidence=0.8,
-            reasoning="Test",
-            semantic_similarity=0.7,
-        )
-
-        assert validator._has_mixed_concerns(group) is True
-
-    def test_has_mixed_concerns_same_type(self, validator):
-        """Test mixed concerns detection for same file types."""
-        files = [
-            FileStatus(path="src/app.py", status_code="M"),
-            FileStatus(path="src/utils.py", status_code="M"),
-        ]
-        group = ChangeGroup(
-            id="test",
-            files=files,
-            category="source",
-            confidence=0.8,
-            reasoning="Test",
-            semantic_similarity=0.7,
-        )
-
-        assert validator._has_mixed_concerns(group) is False
-
-    def test_has_mixed_concerns_test_files(self, validator):
-        """Test mixed concerns detection for test files."""
-        files = [
-            FileStatus(path="tests/test_app.py", status_code="M"),
-            FileStatus(path="tests/test_utils.py", status_code="M"),
-        ]
+    @pytest.mark.parametrize("files,category,expected", MIXED_CONCERN_CASES)
+    def test_has_mixed_concerns(self, validator, files, category, expected):
+        """Test mixed concerns detection across file-type combinations."""
         group = ChangeGroup(
             id="test",
             files=files,
-            category="test",
+            category=category,
             confidence=0.8,
             reasoning="Test",
             semantic_similarity=0.7,
         )
 
-        assert validator._has_mixed_concerns(group) is False
-
-    def test_has_circular_dependencies_migration_and_model(self, validator):
-        """Test circular dependency detection for migration and model."""
-        files = [
-            FileStatus(path="migrations/001_add_user.py", status_code="A"),
-            FileStatus(path="models/user.py", status_code="M"),
-        ]
-        group = ChangeGroup(
-            id="test",
-            files=files,
-            category="database",
-            confidence=0.8,
-            reasoning="Test",
-            semantic_similarity=0.7,
-        )
+        assert validator._has_mixed_concerns(group) is expected
 
-        # Currently returns False but logs warning
-        assert validator._has_circular_dependencies(group) is False
-
-    def test_has_circular_dependencies_schema_and_api(self, validator):
-        """Test circular dependency detection for schema and API."""
-        files = [
-            FileStatus(path="schema/user_schema.py", status_code="M"),
-            FileStatus(path="api/user_controller.py", status_code="M"),
-        ]
-        group = ChangeGroup(
-            id="test",
-            files=files,
-            category="api",
-            confidence=0.8,
-            reasoning="Test",
-            semantic_similarity=0.7,
-        )
-
-        # Currently returns False but logs warning
-        assert validator._has_circular_dependencies(group) is False
-
-    def test_has_circular_dependencies_none(self, validator):
-        """Test circular dependency detection with no dependencies."""
-        files = [
-            FileStatus(path="src/utils.py", status_code="M"),
-            FileStatus(path="src/helpers.py", status_code="M"),
-        ]
+    @pytest.mark.parametrize("files,category", CIRCULAR_DEPENDENCY_CASES)
+    def test_has_circular_dependencies(self, validator, files, category):
+        """Test circular dependency detection (currently always returns False)."""
         group = ChangeGroup(
             id="test",
             files=files,
-            category="source",
+            category=category,
             confidence=0.8,
             reasoning="Test",
             semantic_similarity=0.7,
@@ -355,10 +351,10 @@ class TestAtomicityValidator:
     def test_split_by_directory(self, validator, mock_settings):
         """Test splitting by directory structure."""
         files = [
-            FileStatus(path="src/main.py", status_code="M"),
-            FileStatus(path="src/utils.py", status_code="M"),
-            FileStatus(path="lib/helpers.py", status_code="M"),
-            FileStatus(path="lib/constants.py", status_code="M"),
+            _fs(path="src/main.py", status_code="M"),
+            _fs(path="src/utils.py", status_code="M"),
+            _fs(path="lib/helpers.py", status_code="M"),
+            _fs(path="lib/constants.py", status_code="M"),
         ]
         group = ChangeGroup(
             id="dir_group",
@@ -374,17 +370,18 @@ class TestAtomicityValidator:
         assert len(split_groups) == 2  # Two directories
         # Check files are grouped by directory
         for split_group in split_groups:
-            directories = {str(Path(f.path).parent) for f in split_group.files}
+            # Plain string split beats building a Path per file here.
+            directories = {f.path.rpartition("/")[0] for f in split_group.files}
             assert len(directories) == 1  # All files in same directory
 
     def test_split_by_concern_comprehensive(self, validator):
         """Test splitting by concern with all file types."""
         files = [
-            FileStatus(path="src/main.py", status_code="M"),  # source
-            FileStatus(path="tests/test_main.py", status_code="A"),  # test
-            FileStatus(path="config.yaml", status_code="M"),  # config
-            FileStatus(path="README.md", status_code="M"),  # docs
-            FileStatus(path="data.csv", status_code="A"),  # other
+            _fs(path="src/main.py", status_code="M"),  # source
+            _fs(path="tests/test_main.py", status_code="A"),  # test
+            _fs(path="config.yaml", status_code="M"),  # config
+            _fs(path="README.md", status_code="M"),  # docs
+            _fs(path="data.csv", status_code="A"),  # other
         ]
         group = ChangeGroup(
             id="mixed",
@@ -408,8 +405,8 @@ class TestAtomicityValidator:
     def test_split_by_concern_java_files(self, validator):
         """Test splitting by concern with Java files."""
         files = [
-            FileStatus(path="src/Main.java", status_code="M"),
-            FileStatus(path="src/Utils.java", status_code="M"),
+            _fs(path="src/Main.java", status_code="M"),
+            _fs(path="src/Utils.java", status_code="M"),
         ]
         group = ChangeGroup(
             id="java_group",
@@ -425,15 +422,19 @@ class TestAtomicityValidator:
         assert len(split_groups) == 1  # All source files
         assert split_groups[0].category == "source"
 
-    def test_split_by_size_exact_chunks(self, validator, mock_settings):
-        """Test splitting by size with exact chunk boundaries."""
-        mock_settings.max_files_per_pr = 3
-        files = [
-            FileStatus(path=f"file_{i}.py", status_code="M")
-            for i in range(9)  # Exactly 3 chunks of 3
-        ]
+    @pytest.mark.parametrize("mock_settings", [3], indirect=True)
+    @pytest.mark.parametrize(
+        "nfiles,expected_lens",
+        [
+            pytest.param(9, [3, 3, 3], id="exact_chunks"),
+            pytest.param(10, [3, 3, 3, 1], id="uneven_chunks"),
+        ],
+    )
+    def test_split_by_size(self, validator, mock_settings, nfiles, expected_lens):
+        """Test splitting by size across exact and uneven chunk boundaries."""
+        files = [_fs(path=f"file_{i}.py", status_code="M") for i in range(nfiles)]
         group = ChangeGroup(
-            id="exact_chunks",
+            id="size_split",
             files=files,
             category="source",
             confidence=0.9,
@@ -443,38 +444,13 @@ class TestAtomicityValidator:
 
         split_groups = validator._split_by_size(group)
 
-        assert len(split_groups) == 3
+        assert [len(g.files) for g in split_groups] == expected_lens
         for i, split_group in enumerate(split_groups):
-            assert len(split_group.files) == 3
-            assert split_group.id == f"exact_chunks_chunk_{i}"
+            assert split_group.id == f"size_split_chunk_{i}"
             assert (
                 abs(split_group.confidence - 0.72) < 0.0001
             )  # 0.9 * 0.8 with float tolerance
 
-    def test_split_by_size_uneven_chunks(self, validator, mock_settings):
-        """Test splitting by size with uneven chunks."""
-        mock_settings.max_files_per_pr = 3
-        files = [
-            FileStatus(path=f"file_{i}.py", status_code="M")
-            for i in range(10)  # 3 + 3 + 3 + 1
-        ]
-        group = ChangeGroup(
-            id="uneven_chunks",
-            files=files,
-            category="source",
-            confidence=0.85,
-            reasoning="Large group",
-            semantic_similarity=0.7,
-        )
-
-        split_groups = validator._split_by_size(group)
-
-        assert len(split_groups) == 4
-        assert len(split_groups[0].files) == 3
-        assert len(split_groups[1].files) == 3
-        assert len(split_groups[2].files) == 3
-        assert len(split_groups[3].files) == 1
-
     def test_validate_and_split_multiple_groups(
         self, validator, atomic_group, large_group, mixed_concerns_group, mock_settings
     ):
@@ -504,41 +480,3 @@ class TestAtomicityValidator:
             assert group.semantic_similarity == large_group.semantic_similarity
             assert "split" in group.id.lower() or "chunk" in group.id.lower()
             assert group.confidence <= large_group.confidence
-
-    def test_has_mixed_concerns_config_extensions(self, validator):
-        """Test mixed concerns detection with various config extensions."""
-        files = [
-            FileStatus(path="config.json", status_code="M"),
-            FileStatus(path="settings.yaml", status_code="M"),
-            FileStatus(path="app.toml", status_code="M"),
-        ]
-        group = ChangeGroup(
-            id="configs",
-            files=files,
-            category="config",
-            confidence=0.8,
-            reasoning="Config changes",
-            semantic_similarity=0.9,
-        )
-
-        # All config files, no mixed concerns
-        assert validator._has_mixed_concerns(group) is False
-
-    def test_has_mixed_concerns_doc_extensions(self, validator):
-        """Test mixed concerns detection with various doc extensions."""
-        files = [
-            FileStatus(path="README.md", status_code="M"),
-            FileStatus(path="docs/guide.rst", status_code="M"),
-            FileStatus(path="CHANGELOG.txt", status_code="M"),
-        ]
-        group = ChangeGroup(
-            id="docs",
-            files=files,
-            category="docs",
-            confidence=0.8,
-            reasoning="Documentation changes",
-            semantic_similarity=0.85,
-        )
-
-        # All doc files, no mixed concerns
-        assert validator._has_mixed_concerns(group) is False
@@ -1,123 +1,176 @@
 """Unit tests for grouping engine service."""
 
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
 import pytest
+from mcp_shared_lib.models import (
+    ChangeCategorization,
+    OutstandingChangesAnalysis,
+    RiskAssessment,
+)
+from mcp_shared_lib.models.git.files import FileStatus
 
 from mcp_pr_recommender.services.grouping_engine import GroupingEngine
 
+# One settings stub shared by every module that reads configuration; LLM
+# analysis is disabled so no OpenAI key is needed.
+_SETTINGS_STUB = SimpleNamespace(
+    openai_api_key="test_key",
+    default_strategy="semantic",
+    max_files_per_pr=8,
+    min_files_per_pr=1,
+    similarity_threshold=0.7,
+    enable_llm_analysis=False,
+)
 
-# Mock settings globally to avoid OpenAI API key requirement
-@pytest.fixture(autouse=True)
+
+@pytest.fixture(autouse=True, scope="session")
 def mock_settings():
-    """Mock settings to avoid OpenAI API key requirement."""
-    with patch("mcp_pr_recommender.config.settings") as mock_settings_func:
-        mock_settings_instance = Mock()
-        mock_settings_instance.openai_api_key = "test_key"
-        mock_settings_instance.default_strategy = "semantic"
-        mock_settings_instance.max_files_per_pr = 8
-        mock_settings_instance.min_files_per_pr = 1
-        mock_settings_instance.similarity_threshold = 0.7
-        mock_settings_instance.enable_llm_analysis = True
-        mock_settings_func.return_value = mock_settings_instance
-        yield mock_settings_instance
+    """Point every settings accessor at the shared stub once per session."""
+    mp = pytest.MonkeyPatch()
+    for target in (
+        "mcp_pr_recommender.config.settings",
+        "mcp_pr_recommender.services.grouping_engine.settings",
+        "mcp_pr_recommender.services.semantic_analyzer.settings",
+    ):
+        mp.setattr(target, lambda: _SETTINGS_STUB)
+    yield _SETTINGS_STUB
+    mp.undo()
+
+
+@pytest.fixture(scope="module")
+def event_loop():
+    """Share one event loop across this module's async tests.
+
+    Overrides pytest-asyncio's function-scoped default so the loop is not
+    created and torn down once per test.
+    """
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+# Pre-built stub for the OpenAI client class; new= skips MagicMock
+# construction and attribute-graph building on every patch entry. It must
+# stay callable because SemanticAnalyzer instantiates the class.
+_OPENAI_STUB = Mock(name="AsyncOpenAI")
+
+
+@pytest.fixture(scope="session")
+def grouping_engine(mock_settings):
+    """Create one grouping engine shared by the whole session.
+
+    Settings come from the autouse stub; only the OpenAI client class
+    needs patching while the constructor runs.
+    """
+    with patch("openai.AsyncOpenAI", new=_OPENAI_STUB):
+        return GroupingEngine()
+
+
+_FILE_PATHS = [
+    "src/auth/login.py",
+    "src/auth/logout.py",
+    "src/auth/session.py",
+    "src/models/user.py",
+    "src/models/profile.py",
+    "tests/test_auth.py",
+    "tests/test_user.py",
+    "config/settings.py",
+]
+
+_PRIORITIES = frozenset(("high", "medium", "low"))
+_RISK_LEVELS = frozenset(("low", "medium", "high"))
+
+# Validated once at import; fixtures hand out shallow copies of this tuple.
+_SAMPLE_FILES: tuple[FileStatus, ...] = tuple(
+    FileStatus(path=path, status_code="M", lines_added=10, lines_deleted=2)
+    for path in _FILE_PATHS
+)
+
+
+class _AnalysisWithFiles(OutstandingChangesAnalysis):
+    """Analysis variant declaring the all_changed_files field GroupingEngine reads."""
+
+    all_changed_files: list[FileStatus] = []
+
+
+def _make_analysis(files):
+    """Create an analysis object with the all_changed_files field populated."""
+    return _AnalysisWithFiles(
+        repository_path="test_repo",
+        analysis_timestamp=datetime.now(),
+        total_outstanding_files=len(files),
+        categories=ChangeCategorization(),
+        risk_assessment=RiskAssessment(
+            risk_level="medium",
+            risk_factors=[],
+            large_changes=[],
+            potential_conflicts=[],
+            binary_changes=[],
+        ),
+        summary="Test analysis",
+        recommendations=[],
+        all_changed_files=files,
+    )
+
+
+# With LLM analysis disabled the engine is deterministic, so tests hitting
+# the same (analysis, strategy) pair can share one computed result. Only the
+# module-scoped sample_analysis goes through this cache: id() keys are only
+# stable while the object is alive, and a short-lived analysis could be
+# freed and its address recycled, handing a later test the wrong entry.
+_PR_CACHE: dict[tuple[int, str], object] = {}
+
+
+async def _recommendations(engine, analysis, strategy):
+    key = (id(analysis), strategy)
+    if key not in _PR_CACHE:
+        _PR_CACHE[key] = await engine.generate_pr_recommendations(analysis, strategy)
+    return _PR_CACHE[key]
 
 
 @pytest.mark.unit
 class TestGroupingEngine:
     """Test cases for the grouping engine service."""
 
-    @pytest.fixture
-    def grouping_engine(self):
-        """Create grouping engine instance."""
-        with patch("openai.AsyncOpenAI"), patch(
-            "mcp_pr_recommender.services.semantic_analyzer.settings"
-        ) as mock_sa_settings, patch(
-            "mcp_pr_recommender.services.grouping_engine.settings"
-        ) as mock_ge_settings:
-            # Mock settings for SemanticAnalyzer
-            mock_sa_settings.return_value.openai_api_key = "test_key"
-            # Mock settings for GroupingEngine
-            mock_ge_settings.return_value.openai_api_key = "test_key"
-            mock_ge_settings.return_value.enable_llm_analysis = True
-            mock_ge_settings.return_value.max_files_per_pr = 8
-            mock_ge_settings.return_value.similarity_threshold = 0.7
-            return GroupingEngine()
-
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_file_changes(self):
         """Sample file changes for testing."""
-        from mcp_shared_lib.models.git.files import FileStatus
-
-        file_paths = [
-            "src/auth/login.py",
-            "src/auth/logout.py",
-            "src/auth/session.py",
-            "src/models/user.py",
-            "src/models/profile.py",
-            "tests/test_auth.py",
-            "tests/test_user.py",
-            "config/settings.py",
-        ]
+        return list(_SAMPLE_FILES)
 
-        return [
-            FileStatus(path=path, status_code="M", lines_added=10, lines_deleted=2)
-            for path in file_paths
-        ]
+    @pytest.fixture(scope="module")
+    def sample_analysis(self, sample_file_changes):
+        """Analysis over the shared sample files, built once per module."""
+        return _make_analysis(sample_file_changes)
 
-    def create_analysis_with_files(self, files):
-        """Helper to create analysis object with the expected all_changed_files field."""
-        from datetime import datetime
-
-        from mcp_shared_lib.models import (
-            ChangeCategorization,
-            OutstandingChangesAnalysis,
-            RiskAssessment,
-        )
-
-        analysis = OutstandingChangesAnalysis(
-            repository_path="test_repo",
-            analysis_timestamp=datetime.now(),
-            total_outstanding_files=len(files),
-            categories=ChangeCategorization(),
-            risk_assessment=RiskAssessment(
-                risk_level="medium",
-                risk_factors=[],
-                large_changes=[],
-                potential_conflicts=[],
-                binary_changes=[],
-            ),
-            summary="Test analysis",
-            recommendations=[],
-        )
-        # Add the field that GroupingEngine expects (using object.__setattr__ to bypass validation)
-        object.__setattr__(analysis, "all_changed_files", files)
-        return analysis
+    @pytest.fixture
+    def sample_analysis_varied_sizes(self):
+        """Analysis whose files have varying change sizes (private copy)."""
+        files = [
+            FileStatus(
+                path=path,
+                status_code="M",
+                lines_added=10 * (i + 1),
+                lines_deleted=5 * (i + 1),
+            )
+            for i, path in enumerate(_FILE_PATHS)
+        ]
+        return _make_analysis(files)
 
     @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "strategy", ["semantic", "logical", "directory", "nonexistent_strategy"]
+    )
     async def test_generate_pr_recommendations(
-        self, grouping_engine, sample_file_changes
+        self, grouping_engine, sample_analysis, strategy
     ):
-        """Test generating PR recommendations."""
-        from unittest.mock import patch
-
-        # Create analysis with the expected field
-        analysis = self.create_analysis_with_files(sample_file_changes)
-
-        with patch(
-            "mcp_pr_recommender.services.grouping_engine.settings"
-        ) as mock_runtime_settings:
-            mock_runtime_settings.return_value.enable_llm_analysis = (
-                False  # Skip LLM to avoid API key
-            )
-            mock_runtime_settings.return_value.max_files_per_pr = 8
-            mock_runtime_settings.return_value.similarity_threshold = 0.7
+        """Test generating PR recommendations across grouping strategies."""
+        result = await _recommendations(grouping_engine, sample_analysis, strategy)
 
-            result = await grouping_engine.generate_pr_recommendations(
-                analysis, "semantic"
-            )
-
-        assert result.strategy_name == "semantic"
+        assert result.strategy_name == strategy
         assert len(result.recommended_prs) > 0
         assert len(result.change_groups) > 0
 
@@ -127,166 +180,36 @@ class TestGroupingEngine:
             assert pr.description
             assert len(pr.files) > 0
             assert pr.branch_name
-            assert pr.priority in ["high", "medium", "low"]
-            assert pr.risk_level in ["low", "medium", "high"]
-
-    @pytest.mark.asyncio
-    async def test_generate_pr_recommendations_with_different_strategy(
-        self, grouping_engine, sample_file_changes
-    ):
-        """Test generating PR recommendations with different strategy."""
-        from unittest.mock import patch
-
-        # Create analysis with the expected field
-        analysis = self.create_analysis_with_files(sample_file_changes)
+            assert pr.priority in _PRIORITIES
+            assert pr.risk_level in _RISK_LEVELS
 
-        with patch(
-            "mcp_pr_recommender.services.grouping_engine.settings"
-        ) as mock_runtime_settings:
-            mock_runtime_settings.return_value.enable_llm_analysis = (
-                False  # Skip LLM to avoid API key
+        if strategy == "directory":
+            # Verify directory grouping - auth files should be grouped together
+            auth_files = frozenset(
+                ("src/auth/login.py", "src/auth/logout.py", "src/auth/session.py")
             )
-            mock_runtime_settings.return_value.max_files_per_pr = 8
-            mock_runtime_settings.return_value.similarity_threshold = 0.7
-
-            result = await grouping_engine.generate_pr_recommendations(
-                analysis, "logical"
+            assert any(
+                auth_files.intersection(pr.files) for pr in result.recommended_prs
             )
 
-        assert result.strategy_name == "logical"
-        assert len(result.recommended_prs) > 0
-
     @pytest.mark.asyncio
     async def test_group_files_empty_input(self, grouping_engine):
         """Test grouping with empty file changes."""
-        from datetime import datetime
-        from unittest.mock import patch
-
-        from mcp_shared_lib.models import (
-            ChangeCategorization,
-            OutstandingChangesAnalysis,
-            RiskAssessment,
-        )
-
-        # Create real analysis object, then add the missing field
-        analysis = OutstandingChangesAnalysis(
-            repository_path="test_repo",
-            analysis_timestamp=datetime.now(),
-            total_outstanding_files=0,
-            categories=ChangeCategorization(),
-            risk_assessment=RiskAssessment(
-                risk_level="low",
-                risk_factors=[],
-                large_changes=[],
-                potential_conflicts=[],
-                binary_changes=[],
-            ),
-            summary="Test analysis",
-            recommendations=[],
-        )
-        # Add the field that GroupingEngine expects (using object.__setattr__ to bypass validation)
-        object.__setattr__(analysis, "all_changed_files", [])
-
-        with patch(
-            "mcp_pr_recommender.services.grouping_engine.settings"
-        ) as mock_runtime_settings:
-            mock_runtime_settings.return_value.enable_llm_analysis = False
-            mock_runtime_settings.return_value.max_files_per_pr = 8
-            mock_runtime_settings.return_value.similarity_threshold = 0.7
-
-            result = await grouping_engine.generate_pr_recommendations(
-                analysis, "semantic"
-            )
+        analysis = _make_analysis([])
+
+        result = await grouping_engine.generate_pr_recommendations(analysis, "semantic")
 
         assert len(result.recommended_prs) == 0
         assert len(result.change_groups) == 0
 
     @pytest.mark.asyncio
-    async def test_group_files_by_directory_strategy(
-        self, grouping_engine, sample_file_changes
-    ):
-        """Test directory-based grouping logic."""
-        from unittest.mock import patch
-
-        # Create analysis with the expected field
-        analysis = self.create_analysis_with_files(sample_file_changes)
-
-        with patch(
-            "mcp_pr_recommender.services.grouping_engine.settings"
-        ) as mock_runtime_settings:
-            mock_runtime_settings.return_value.enable_llm_analysis = (
-                False  # Skip LLM to avoid API key
-            )
-            mock_runtime_settings.return_value.max_files_per_pr = 8
-            mock_runtime_settings.return_value.similarity_threshold = 0.7
-
-            result = await grouping_engine.generate_pr_recommendations(
-                analysis, "directory"
-            )
-
-        assert len(result.recommended_prs) > 0
-
-        # Verify directory grouping - auth files should be grouped together
-        auth_files = ["src/auth/login.py", "src/auth/logout.py", "src/auth/session.py"]
-        found_auth_pr = False
-        for pr in result.recommended_prs:
-            if any(f in pr.files for f in auth_files):
-                found_auth_pr = True
-                break
-        assert found_auth_pr
-
-    @pytest.mark.asyncio
-    async def test_group_files_invalid_strategy(
-        self, grouping_engine, sample_file_changes
+    async def test_estimate_group_size(
+        self, grouping_engine, sample_analysis_varied_sizes
     ):
-        """Test handling of different strategy names."""
-        from unittest.mock import patch
-
-        # Create analysis with the expected field
-        analysis = self.create_analysis_with_files(sample_file_changes)
-
-        with patch(
-            "mcp_pr_recommender.services.grouping_engine.settings"
-        ) as mock_runtime_settings:
-            mock_runtime_settings.return_value.enable_llm_analysis = (
-                False  # Skip LLM to avoid API key
-            )
-            mock_runtime_settings.return_value.max_files_per_pr = 8
-            mock_runtime_settings.return_value.similarity_threshold = 0.7
-
-            # The GroupingEngine should handle any strategy name gracefully
-            result = await grouping_engine.generate_pr_recommendations(
-                analysis, "nonexistent_strategy"
-            )
-
-        assert result.strategy_name == "nonexistent_strategy"
-        assert len(result.recommended_prs) > 0
-
-    @pytest.mark.asyncio
-    async def test_estimate_group_size(self, grouping_engine, sample_file_changes):
         """Test group size estimation via review time."""
-        from unittest.mock import patch
-
-        # Set all_changed_files with varying sizes
-        for i, change in enumerate(sample_file_changes):
-            change.lines_added = 10 * (i + 1)
-            change.lines_deleted = 5 * (i + 1)
-
-        # Create analysis with the expected field
-        analysis = self.create_analysis_with_files(sample_file_changes)
+        analysis = sample_analysis_varied_sizes
 
-        with patch(
-            "mcp_pr_recommender.services.grouping_engine.settings"
-        ) as mock_runtime_settings:
-            mock_runtime_settings.return_value.enable_llm_analysis = (
-                False  # Skip LLM to avoid API key
-            )
-            mock_runtime_settings.return_value.max_files_per_pr = 8
-            mock_runtime_settings.return_value.similarity_threshold = 0.7
-
-            result = await grouping_engine.generate_pr_recommendations(
-                analysis, "semantic"
-            )
+        result = await grouping_engine.generate_pr_recommendations(analysis, "semantic")
 
         # Verify that review times are reasonable
         for pr in result.recommended_prs:
@@ -1,7 +1,9 @@
 """Comprehensive unit tests for the SemanticAnalyzer service."""
 
 import json
-from unittest.mock import AsyncMock, Mock, patch
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
 import pytest
 from mcp_shared_lib.models import (
@@ -14,31 +16,175 @@ from mcp_shared_lib.models.git.changes import FileStatus
 from mcp_pr_recommender.models.pr.recommendations import ChangeGroup, PRRecommendation
 from mcp_pr_recommender.services.semantic_analyzer import SemanticAnalyzer
 
+# Bulk file lists validated once at import; tests pass shallow copies in.
+_LARGE_FILE_LIST = tuple(
+    FileStatus(path=f"file{i}.py", status_code="M", lines_added=100, lines_deleted=50)
+    for i in range(10)
+)
+_MULTI_FILE_LIST = tuple(
+    FileStatus(path=f"file{i}.py", status_code="M", lines_added=60, lines_deleted=40)
+    for i in range(12)
+)
+
+
+_FALLBACK_WITH_CHANGES = (
+    FileStatus(path="src/main.py", status_code="M", lines_added=10, lines_deleted=5),
+    FileStatus(
+        path="tests/test_main.py", status_code="A", lines_added=50, lines_deleted=0
+    ),
+    FileStatus(path="pyproject.toml", status_code="M", lines_added=2, lines_deleted=1),
+    FileStatus(path="docs/guide.md", status_code="M", lines_added=5, lines_deleted=2),
+)
+_FALLBACK_NO_CHANGES = (
+    FileStatus(path="file1.py", status_code="M", lines_added=0, lines_deleted=0),
+    FileStatus(path="file2.py", status_code="M", lines_added=0, lines_deleted=0),
+)
+_FALLBACK_MIXED = (
+    FileStatus(path="app.js", status_code="M", lines_added=10, lines_deleted=5),
+    FileStatus(path="Main.java", status_code="A", lines_added=100, lines_deleted=0),
+    FileStatus(path="server.go", status_code="M", lines_added=20, lines_deleted=10),
+    FileStatus(
+        path="requirements.txt", status_code="M", lines_added=2, lines_deleted=1
+    ),
+)
+
+
+# Deterministic LLM payloads serialized once at import instead of per test.
+_FEATURE_TEST_RESPONSE_JSON = json.dumps(
+    {
+        "groups": [
+            {
+                "id": "source_changes",
+                "files": ["src/main.py", "src/utils.py"],
+                "category": "feature",
+                "confidence": 0.9,
+                "reasoning": "Core source code changes",
+            },
+            {
+                "id": "test_changes",
+                "files": ["tests/test_main.py"],
+                "category": "test",
+                "confidence": 0.85,
+                "reasoning": "Related test updates",
+            },
+        ],
+        "rationale": "Grouped by functionality",
+    }
+)
+
+_SOURCE_GROUP_RESPONSE_JSON = json.dumps(
+    {
+        "groups": [
+            {
+                "id": "group_1",
+                "files": ["src/main.py", "src/utils.py"],
+                "category": "feature",
+                "confidence": 0.9,
+                "reasoning": "Related source changes",
+            }
+        ]
+    }
+)
+
+_INTEGRATION_RESPONSE_JSON = json.dumps(
+    {
+        "groups": [
+            {
+                "id": "core_feature",
+                "files": ["src/main.py", "src/utils.py", "tests/test_main.py"],
+                "category": "feature",
+                "confidence": 0.95,
+                "reasoning": "Core feature with tests",
+            },
+            {
+                "id": "docs_and_config",
+                "files": ["config.yaml", "README.md"],
+                "category": "chore",
+                "confidence": 0.8,
+                "reasoning": "Documentation and configuration updates",
+            },
+        ],
+        "rationale": "Grouped by logical units",
+    }
+)
+
+
+def _make_llm_response(content):
+    """Build a response object exposing .choices[0].message.content.
+
+    SimpleNamespace is far cheaper to construct than Mock and the tests
+    only ever read attributes from the response.
+    """
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+    )
+
+
+@pytest.fixture(scope="module")
+def mock_llm_responses():
+    """Pre-built LLM response objects keyed by scenario."""
+    return {
+        "feature_and_test": _make_llm_response(_FEATURE_TEST_RESPONSE_JSON),
+        "source_group": _make_llm_response(_SOURCE_GROUP_RESPONSE_JSON),
+        "integration": _make_llm_response(_INTEGRATION_RESPONSE_JSON),
+    }
+
+
+class _FakeAsyncOpenAI:
+    """Minimal AsyncOpenAI stand-in; built once instead of patching per test."""
+
+    def __init__(self, api_key=None):
+        self.api_key = api_key
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=AsyncMock()))
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _patch_openai():
+    """Install the fake OpenAI client class once for this module."""
+    mp = pytest.MonkeyPatch()
+    mp.setattr(
+        "mcp_pr_recommender.services.semantic_analyzer.openai.AsyncOpenAI",
+        _FakeAsyncOpenAI,
+    )
+    yield
+    mp.undo()
+
 
 @pytest.mark.unit
 class TestSemanticAnalyzer:
     """Test the SemanticAnalyzer service."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_settings(self):
         """Mock settings for testing."""
-        with patch(
-            "mcp_pr_recommender.services.semantic_analyzer.settings"
-        ) as mock_settings_func:
-            mock_settings_instance = Mock()
-            mock_settings_instance.openai_api_key = "test_key"
-            mock_settings_instance.openai_model = "gpt-4"
-            mock_settings_instance.max_tokens_per_request = 1000
-            mock_settings_func.return_value = mock_settings_instance
-            yield mock_settings_instance
+        stub = SimpleNamespace(
+            openai_api_key="test_key",
+            openai_model="gpt-4",
+            max_tokens_per_request=1000,
+        )
+        mp = pytest.MonkeyPatch()
+        mp.setattr(
+            "mcp_pr_recommender.services.semantic_analyzer.settings", lambda: stub
+        )
+        yield stub
+        mp.undo()
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def analyzer(self, mock_settings):
-        """Create semantic analyzer instance."""
-        with patch("mcp_pr_recommender.services.semantic_analyzer.openai.AsyncOpenAI"):
-            return SemanticAnalyzer()
+        """Create semantic analyzer instance.
+
+        Module-scoped: the analyzer is stateless apart from its client, and
+        tests that exercise the LLM path reassign
+        ``client.chat.completions.create`` before awaiting it.
+        """
+        return SemanticAnalyzer()
 
     @pytest.fixture
+    def raising_create(self):
+        """AsyncMock whose awaits raise, shared by the exception-path tests."""
+        return AsyncMock(side_effect=Exception("Test error"))
+
+    @pytest.fixture(scope="module")
     def sample_files(self):
         """Create sample file status objects."""
         return [
@@ -62,11 +208,9 @@ class TestSemanticAnalyzer:
             ),
         ]
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_analysis(self):
         """Create sample analysis object."""
-        from pathlib import Path
-
         return OutstandingChangesAnalysis(
             repository_path=Path("/test/repo"),
             summary="Multiple changes across source, tests, and configuration",
@@ -92,47 +236,21 @@ class TestSemanticAnalyzer:
     @pytest.mark.asyncio
     async def test_analyzer_initialization(self, mock_settings):
         """Test analyzer initialization."""
-        with patch(
-            "mcp_pr_recommender.services.semantic_analyzer.openai.AsyncOpenAI"
-        ) as mock_openai:
-            analyzer = SemanticAnalyzer()
+        analyzer = SemanticAnalyzer()
 
-            assert analyzer.client is not None
-            assert analyzer.logger is not None
-            mock_openai.assert_called_once_with(api_key="test_key")
+        assert analyzer.client is not None
+        assert analyzer.logger is not None
+        assert analyzer.client.api_key == "test_key"
 
     @pytest.mark.asyncio
     async def test_analyze_and_generate_prs_success(
-        self, analyzer, sample_files, sample_analysis
+        self, analyzer, sample_files, sample_analysis, mock_llm_responses
     ):
         """Test successful PR generation."""
-        # Mock LLM response
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].message.content = json.dumps(
-            {
-                "groups": [
-                    {
-                        "id": "source_changes",
-                        "files": ["src/main.py", "src/utils.py"],
-                        "category": "feature",
-                        "confidence": 0.9,
-                        "reasoning": "Core source code changes",
-                    },
-                    {
-                        "id": "test_changes",
-                        "files": ["tests/test_main.py"],
-                        "category": "test",
-                        "confidence": 0.85,
-                        "reasoning": "Related test updates",
-                    },
-                ],
-                "rationale": "Grouped by functionality",
-            }
+        analyzer.client.chat.completions.create = AsyncMock(
+            return_value=mock_llm_responses["feature_and_test"]
         )
 
-        analyzer.client.chat.completions.create = AsyncMock(return_value=mock_response)
-
         result = await analyzer.analyze_and_generate_prs(sample_files, sample_analysis)
 
         assert len(result) >= 2  # May include ungrouped files as 3rd group
@@ -153,7 +271,7 @@ class TestSemanticAnalyzer:
 
     @pytest.mark.asyncio
     async def test_analyze_and_generate_prs_filtered_files(
-        self, analyzer, sample_analysis
+        self, analyzer, sample_analysis, raising_create
     ):
         """Test PR generation filters out junk files."""
         files = [
@@ -164,10 +282,8 @@ class TestSemanticAnalyzer:
             FileStatus(path=".DS_Store", status_code="M"),
         ]
 
-        # Mock LLM to return fallback grouping
-        analyzer.client.chat.completions.create = AsyncMock(
-            side_effect=Exception("Test error")
-        )
+        # Mock LLM to force the fallback grouping path
+        analyzer.client.chat.completions.create = raising_create
 
         result = await analyzer.analyze_and_generate_prs(files, sample_analysis)
 
@@ -177,27 +293,13 @@ class TestSemanticAnalyzer:
 
     @pytest.mark.asyncio
     async def test_llm_group_files_success(
-        self, analyzer, sample_files, sample_analysis
+        self, analyzer, sample_files, sample_analysis, mock_llm_responses
     ):
         """Test successful LLM grouping."""
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].message.content = json.dumps(
-            {
-                "groups": [
-                    {
-                        "id": "group_1",
-                        "files": ["src/main.py", "src/utils.py"],
-                        "category": "feature",
-                        "confidence": 0.9,
-                        "reasoning": "Related source changes",
-                    }
-                ]
-            }
+        analyzer.client.chat.completions.create = AsyncMock(
+            return_value=mock_llm_responses["source_group"]
         )
 
-        analyzer.client.chat.completions.create = AsyncMock(return_value=mock_response)
-
         groups = await analyzer._llm_group_files(sample_files, sample_analysis)
 
         assert len(groups) >= 1  # May include ungrouped files
@@ -209,11 +311,9 @@ class TestSemanticAnalyzer:
         self, analyzer, sample_files, sample_analysis
     ):
         """Test LLM grouping with None response."""
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].message.content = None
-
-        analyzer.client.chat.completions.create = AsyncMock(return_value=mock_response)
+        analyzer.client.chat.completions.create = AsyncMock(
+            return_value=_make_llm_response(None)
+        )
 
         groups = await analyzer._llm_group_files(sample_files, sample_analysis)
 
@@ -222,12 +322,10 @@ class TestSemanticAnalyzer:
 
     @pytest.mark.asyncio
     async def test_llm_group_files_exception(
-        self, analyzer, sample_files, sample_analysis
+        self, analyzer, sample_files, sample_analysis, raising_create
     ):
         """Test LLM grouping with exception."""
-        analyzer.client.chat.completions.create = AsyncMock(
-            side_effect=Exception("API error")
-        )
+        analyzer.client.chat.completions.create = raising_create
 
         groups = await analyzer._llm_group_files(sample_files, sample_analysis)
 
@@ -250,17 +348,23 @@ class TestSemanticAnalyzer:
         assert len(result) == 2
         assert all(f.path in ["src/main.py", "src/utils.py"] for f in result)
 
-    def test_should_exclude_file(self, analyzer):
+    @pytest.mark.parametrize(
+        "path,expected",
+        [
+            ("__pycache__/file.pyc", True),
+            ("file.pyc", True),
+            (".git/config", True),
+            ("node_modules/package.js", True),
+            (".ds_store", True),
+            ("thumbs.db", True),
+            (".pytest_cache/data", True),
+            ("src/main.py", False),
+            ("README.md", False),
+        ],
+    )
+    def test_should_exclude_file(self, analyzer, path, expected):
         """Test file exclusion logic."""
-        assert analyzer._should_exclude_file("__pycache__/file.pyc") is True
-        assert analyzer._should_exclude_file("file.pyc") is True
-        assert analyzer._should_exclude_file(".git/config") is True
-        assert analyzer._should_exclude_file("node_modules/package.js") is True
-        assert analyzer._should_exclude_file(".ds_store") is True  # Lowercase version
-        assert analyzer._should_exclude_file("thumbs.db") is True
-        assert analyzer._should_exclude_file(".pytest_cache/data") is True
-        assert analyzer._should_exclude_file("src/main.py") is False
-        assert analyzer._should_exclude_file("README.md") is False
+        assert analyzer._should_exclude_file(path) is expected
 
     def test_create_grouping_prompt(self, analyzer, sample_files, sample_analysis):
         """Test grouping prompt creation."""
@@ -349,68 +453,33 @@ class TestSemanticAnalyzer:
         assert groups[1].id == "ungrouped_files"
         assert len(groups[1].files) == 4  # All except src/main.py
 
-    def test_fallback_grouping_with_changes(self, analyzer):
-        """Test fallback grouping with files having changes."""
-        files = [
-            FileStatus(
-                path="src/main.py", status_code="M", lines_added=10, lines_deleted=5
-            ),
-            FileStatus(
-                path="tests/test_main.py",
-                status_code="A",
-                lines_added=50,
-                lines_deleted=0,
+    @pytest.mark.parametrize(
+        "files,expected_ids",
+        [
+            pytest.param(
+                _FALLBACK_WITH_CHANGES,
+                {"source_code_changes", "configuration_changes"},
+                id="with_changes",
             ),
-            FileStatus(
-                path="pyproject.toml", status_code="M", lines_added=2, lines_deleted=1
+            pytest.param(
+                _FALLBACK_NO_CHANGES, {"no_changes_cleanup"}, id="without_changes"
             ),
-            FileStatus(
-                path="docs/guide.md", status_code="M", lines_added=5, lines_deleted=2
+            pytest.param(
+                _FALLBACK_MIXED,
+                {"source_code_changes", "configuration_changes"},
+                id="mixed",
             ),
-        ]
-
-        groups = analyzer._fallback_grouping(files)
-
-        assert len(groups) >= 2
-        assert any(g.id == "source_code_changes" for g in groups)
-        assert any(g.id == "configuration_changes" for g in groups)
-
-    def test_fallback_grouping_without_changes(self, analyzer):
-        """Test fallback grouping with files having no changes."""
-        files = [
-            FileStatus(
-                path="file1.py", status_code="M", lines_added=0, lines_deleted=0
-            ),
-            FileStatus(
-                path="file2.py", status_code="M", lines_added=0, lines_deleted=0
-            ),
-        ]
-
-        groups = analyzer._fallback_grouping(files)
-
-        assert len(groups) == 1
-        assert groups[0].id == "no_changes_cleanup"
-        assert len(groups[0].files) == 2
-
-    def test_fallback_grouping_mixed(self, analyzer):
-        """Test fallback grouping with mixed file types."""
-        files = [
-            FileStatus(path="app.js", status_code="M", lines_added=10, lines_deleted=5),
-            FileStatus(
-                path="Main.java", status_code="A", lines_added=100, lines_deleted=0
-            ),
-            FileStatus(
-                path="server.go", status_code="M", lines_added=20, lines_deleted=10
-            ),
-            FileStatus(
-                path="requirements.txt", status_code="M", lines_added=2, lines_deleted=1
-            ),
-        ]
-
-        groups = analyzer._fallback_grouping(files)
-
-        assert any(g.id == "source_code_changes" for g in groups)
-        assert any(g.id == "configuration_changes" for g in groups)
+        ],
+    )
+    def test_fallback_grouping(self, analyzer, files, expected_ids):
+        """Test fallback grouping across changed, unchanged and mixed files."""
+        groups = analyzer._fallback_grouping(list(files))
+
+        ids = {g.id for g in groups}
+        assert expected_ids <= ids
+        if expected_ids == {"no_changes_cleanup"}:
+            assert len(groups) == 1
+            assert len(groups[0].files) == 2
 
     def test_generate_pr_recommendations(self, analyzer, sample_analysis):
         """Test PR recommendation generation."""
@@ -557,15 +626,7 @@ class TestSemanticAnalyzer:
         """Test description for large changeset."""
         group = ChangeGroup(
             id="large_group",
-            files=[
-                FileStatus(
-                    path=f"file{i}.py",
-                    status_code="M",
-                    lines_added=100,
-                    lines_deleted=50,
-                )
-                for i in range(10)
-            ],
+            files=list(_LARGE_FILE_LIST),
             category="feature",
             confidence=0.9,
             reasoning="Large changes",
@@ -577,29 +638,40 @@ class TestSemanticAnalyzer:
         assert "Large changeset" in description
         assert "review carefully" in description
 
-    def test_generate_branch_name(self, analyzer):
-        """Test branch name generation."""
-        test_cases = [
+    @pytest.mark.parametrize(
+        "group_id,category,expected",
+        [
             ("source_code_changes", "feature", "feature/core-updates"),
             ("configuration_changes", "config", "config/dependencies"),
             ("no_changes_cleanup", "chore", "chore/cleanup"),
             ("auth_system_changes", "feature", "feature/auth-system"),
-        ]
-
-        for group_id, category, expected in test_cases:
-            group = ChangeGroup(
-                id=group_id,
-                files=[],
-                category=category,
-                confidence=0.9,
-                reasoning="Test",
-                semantic_similarity=0.8,
-            )
-
-            branch_name = analyzer._generate_branch_name(group)
-            assert branch_name == expected
+        ],
+    )
+    def test_generate_branch_name(self, analyzer, group_id, category, expected):
+        """Test branch name generation."""
+        group = ChangeGroup(
+            id=group_id,
+            files=[],
+            category=category,
+            confidence=0.9,
+            reasoning="Test",
+            semantic_similarity=0.8,
+        )
 
-    def test_determine_priority(self, analyzer):
+        assert analyzer._generate_branch_name(group) == expected
+
+    @pytest.mark.parametrize(
+        "category,total_changes,file_count,expected",
+        [
+            pytest.param("feature", 15, 1, "high", id="feature_with_changes"),
+            pytest.param("config", 15, 1, "medium", id="config"),
+            pytest.param("config", 0, 0, "low", id="no_changes"),
+            pytest.param("chore", 600, 1, "high", id="large_changes"),
+        ],
+    )
+    def test_determine_priority(
+        self, analyzer, category, total_changes, file_count, expected
+    ):
         """Test priority determination."""
         group = ChangeGroup(
             id="test",
@@ -608,42 +680,29 @@ class TestSemanticAnalyzer:
                     path="file.py", status_code="M", lines_added=10, lines_deleted=5
                 )
             ],
-            category="feature",
+            category=category,
             confidence=0.9,
             reasoning="Test",
             semantic_similarity=0.8,
         )
 
-        # Feature with changes -> high
-        assert analyzer._determine_priority(group, 15, 1) == "high"
-
-        # Config -> medium
-        group.category = "config"
-        assert analyzer._determine_priority(group, 15, 1) == "medium"
-
-        # No changes -> low
-        assert analyzer._determine_priority(group, 0, 0) == "low"
-
-        # Large changes -> high
-        group.category = "chore"
-        assert analyzer._determine_priority(group, 600, 1) == "high"
+        assert (
+            analyzer._determine_priority(group, total_changes, file_count) == expected
+        )
 
-    def test_determine_risk(self, analyzer):
+    @pytest.mark.parametrize(
+        "total_changes,file_count,expected",
+        [
+            pytest.param(0, 5, "low", id="no_changes"),
+            pytest.param(50, 2, "low", id="small_changes"),
+            pytest.param(300, 5, "medium", id="medium_changes"),
+            pytest.param(1500, 10, "high", id="large_changes"),
+            pytest.param(100, 10, "medium", id="many_files"),
+        ],
+    )
+    def test_determine_risk(self, analyzer, total_changes, file_count, expected):
         """Test risk determination."""
-        # No changes -> low risk
-        assert analyzer._determine_risk(0, 5) == "low"
-
-        # Small changes -> low risk
-        assert analyzer._determine_risk(50, 2) == "low"
-
-        # Medium changes -> medium risk
-        assert analyzer._determine_risk(300, 5) == "medium"
-
-        # Large changes -> high risk
-        assert analyzer._determine_risk(1500, 10) == "high"
-
-        # Many files -> medium risk
-        assert analyzer._determine_risk(100, 10) == "medium"
+        assert analyzer._determine_risk(total_changes, file_count) == expected
 
     def test_estimate_review_time(self, analyzer):
         """Test review time estimation."""
@@ -661,15 +720,7 @@ class TestSemanticAnalyzer:
         """Test label generation."""
         group = ChangeGroup(
             id="test",
-            files=[
-                FileStatus(
-                    path=f"file{i}.py",
-                    status_code="M",
-                    lines_added=60,
-                    lines_deleted=40,
-                )
-                for i in range(12)
-            ],
+            files=list(_MULTI_FILE_LIST),
             category="feature",
             confidence=0.9,
             reasoning="Test",
@@ -691,7 +742,7 @@ class TestSemanticAnalyzer:
 
     @pytest.mark.asyncio
     async def test_analyze_and_generate_prs_integration(
-        self, analyzer, sample_analysis
+        self, analyzer, sample_analysis, mock_llm_responses
     ):
         """Test full integration of analyze_and_generate_prs."""
         files = [
@@ -718,33 +769,10 @@ class TestSemanticAnalyzer:
             ),
         ]
 
-        # Mock successful LLM response
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].message.content = json.dumps(
-            {
-                "groups": [
-                    {
-                        "id": "core_feature",
-                        "files": ["src/main.py", "src/utils.py", "tests/test_main.py"],
-                        "category": "feature",
-                        "confidence": 0.95,
-                        "reasoning": "Core feature with tests",
-                    },
-                    {
-                        "id": "docs_and_config",
-                        "files": ["config.yaml", "README.md"],
-                        "category": "chore",
-                        "confidence": 0.8,
-                        "reasoning": "Documentation and configuration updates",
-                    },
-                ],
-                "rationale": "Grouped by logical units",
-            }
+        analyzer.client.chat.completions.create = AsyncMock(
+            return_value=mock_llm_responses["integration"]
         )
 
-        analyzer.client.chat.completions.create = AsyncMock(return_value=mock_response)
-
         recommendations = await analyzer.analyze_and_generate_prs(
             files, sample_analysis
         )
@@ -4,121 +4,186 @@ Enhanced test client for the MCP PR Recommender FastMCP server.
 Tests full integration with mcp_local_repo_analyzer for the "messy developer" scenario.
 Now includes proper untracked file handling.
 """
+import argparse
 import asyncio
 import json
+import mmap
 import os
+import re
+import stat
 import sys
+import traceback
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, TypedDict
 
 import pytest
+import pytest_asyncio
 from fastmcp import Client
 
-# Mock data similar to what mcp_local_repo_analyzer would provide
-MOCK_ANALYSIS = {
-    "repository_path": "/path/to/repo",
-    "analysis_timestamp": datetime.now().isoformat(),
-    "total_outstanding_files": 5,
-    "categories": {
-        "critical_files": [],
-        "source_code": ["src/main.py", "src/utils.py", "src/models.py"],
-        "documentation": ["README.md", "docs/api.md"],
-        "tests": ["tests/test_main.py", "tests/test_utils.py"],
-        "configuration": ["pyproject.toml", ".env.example"],
-        "other": ["Makefile"],
-    },
-    "risk_assessment": {
-        "risk_level": "medium",
-        "risk_factors": ["Multiple file types", "Large changeset"],
-        "large_changes": ["src/main.py"],
-        "potential_conflicts": [],
-    },
-    "summary": "5 files with mixed changes across source code, tests, and configuration",
-    "working_directory_files": [
-        {
-            "path": "src/main.py",
-            "status_code": "M",
-            "staged": False,
-            "lines_added": 45,
-            "lines_deleted": 12,
-            "is_binary": False,
-        },
-        {
-            "path": "src/utils.py",
-            "status_code": "M",
-            "staged": False,
-            "lines_added": 15,
-            "lines_deleted": 3,
-            "is_binary": False,
-        },
-        {
-            "path": "src/models.py",
-            "status_code": "A",
-            "staged": False,
-            "lines_added": 67,
-            "lines_deleted": 0,
-            "is_binary": False,
-        },
-        {
-            "path": "tests/test_main.py",
-            "status_code": "M",
-            "staged": False,
-            "lines_added": 23,
-            "lines_deleted": 5,
-            "is_binary": False,
-        },
-        {
-            "path": "tests/test_utils.py",
-            "status_code": "A",
-            "staged": False,
-            "lines_added": 18,
-            "lines_deleted": 0,
-            "is_binary": False,
-        },
-        {
-            "path": "README.md",
-            "status_code": "M",
-            "staged": False,
-            "lines_added": 8,
-            "lines_deleted": 2,
-            "is_binary": False,
+
+class QuickStats(TypedDict, total=False):
+    """Headline counters the analyzer reports in its outstanding summary."""
+
+    working_directory_changes: int
+    staged_changes: int
+    unpushed_commits: int
+
+
+class ComprehensiveStats(TypedDict, total=False):
+    """Counters produced by get_comprehensive_file_analysis."""
+
+    tracked_count: int
+    untracked_count: int
+    staged_count: int
+    files_with_changes: int
+    total_new_lines: int
+    untracked_lines: int
+
+
+class AnalysisData(TypedDict, total=False):
+    """Shape of the analyzer payload the workflow tests route on.
+
+    Declaring the keys once lets each consumer pull sub-dicts into typed
+    locals instead of repeating chained .get lookups, and gives mypy a
+    fighting chance against typos in key names.
+    """
+
+    repository_path: str
+    has_outstanding_work: bool
+    total_outstanding_changes: int
+    risk_assessment: dict[str, Any]
+    quick_stats: QuickStats
+    comprehensive_stats: ComprehensiveStats
+
+
+# Mock data similar to what mcp_local_repo_analyzer would provide. Wrapped in
+# a read-only proxy so tests sharing it cannot leak mutations into each other.
+MOCK_ANALYSIS = MappingProxyType(
+    {
+        "repository_path": "/path/to/repo",
+        "total_outstanding_files": 5,
+        "categories": {
+            "critical_files": [],
+            "source_code": ["src/main.py", "src/utils.py", "src/models.py"],
+            "documentation": ["README.md", "docs/api.md"],
+            "tests": ["tests/test_main.py", "tests/test_utils.py"],
+            "configuration": ["pyproject.toml", ".env.example"],
+            "other": ["Makefile"],
         },
-        {
-            "path": "pyproject.toml",
-            "status_code": "M",
-            "staged": False,
-            "lines_added": 3,
-            "lines_deleted": 1,
-            "is_binary": False,
+        "risk_assessment": {
+            "risk_level": "medium",
+            "risk_factors": ["Multiple file types", "Large changeset"],
+            "large_changes": ["src/main.py"],
+            "potential_conflicts": [],
         },
-    ],
-    "staged_files": [],
-}
+        "summary": "5 files with mixed changes across source code, tests, and configuration",
+        "working_directory_files": [
+            {
+                "path": "src/main.py",
+                "status_code": "M",
+                "staged": False,
+                "lines_added": 45,
+                "lines_deleted": 12,
+                "is_binary": False,
+            },
+            {
+                "path": "src/utils.py",
+                "status_code": "M",
+                "staged": False,
+                "lines_added": 15,
+                "lines_deleted": 3,
+                "is_binary": False,
+            },
+            {
+                "path": "src/models.py",
+                "status_code": "A",
+                "staged": False,
+                "lines_added": 67,
+                "lines_deleted": 0,
+                "is_binary": False,
+            },
+            {
+                "path": "tests/test_main.py",
+                "status_code": "M",
+                "staged": False,
+                "lines_added": 23,
+                "lines_deleted": 5,
+                "is_binary": False,
+            },
+            {
+                "path": "tests/test_utils.py",
+                "status_code": "A",
+                "staged": False,
+                "lines_added": 18,
+                "lines_deleted": 0,
+                "is_binary": False,
+            },
+            {
+                "path": "README.md",
+                "status_code": "M",
+                "staged": False,
+                "lines_added": 8,
+                "lines_deleted": 2,
+                "is_binary": False,
+            },
+            {
+                "path": "pyproject.toml",
+                "status_code": "M",
+                "staged": False,
+                "lines_added": 3,
+                "lines_deleted": 1,
+                "is_binary": False,
+            },
+        ],
+        "staged_files": [],
+    }
+)
+
+
+def _mock_analysis() -> dict[str, Any]:
+    """Copy of MOCK_ANALYSIS stamped with a current analysis timestamp.
+
+    The timestamp is taken lazily so importing this module (e.g. during
+    collection) does no clock work and the value reflects when the test
+    actually ran.
+    """
+    return {**MOCK_ANALYSIS, "analysis_timestamp": datetime.now().isoformat()}
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def analysis_data():
-    """Fixture providing mock analysis data for workflow tests."""
-    return MOCK_ANALYSIS
+    """Fixture providing mock analysis data for workflow tests.
+
+    The data is read-only and shared, so one instance per module suffices.
+    """
+    return MappingProxyType(_mock_analysis())
+
+
+# Resolved once; the client helpers run per connection and resolve() hits the
+# filesystem every time it is called.
+_ANALYZER_PATH = "../mcp_local_repo_analyzer/src/local_git_analyzer/main.py"
+_ANALYZER_PYTHONPATH = str(Path("../mcp_local_repo_analyzer").resolve())
+_RECOMMENDER_PYTHONPATH = str(Path("src").resolve())
 
 
 async def get_mcp_local_repo_analyzer_client():
     """Create a client for the mcp_local_repo_analyzer server."""
     from fastmcp.client.transports import PythonStdioTransport
 
-    # Path to the other MCP server
-    analyzer_path = "../mcp_local_repo_analyzer/src/local_git_analyzer/main.py"
-
-    if not Path(analyzer_path).exists():
-        raise FileNotFoundError(f"mcp_local_repo_analyzer not found at {analyzer_path}")
+    if not Path(_ANALYZER_PATH).exists():
+        raise FileNotFoundError(
+            f"mcp_local_repo_analyzer not found at {_ANALYZER_PATH}"
+        )
 
     transport = PythonStdioTransport(
-        script_path=analyzer_path,
+        script_path=_ANALYZER_PATH,
         python_cmd="python",
         env={
             **os.environ,
-            "PYTHONPATH": str(Path("../mcp_local_repo_analyzer").resolve()),
+            "PYTHONPATH": _ANALYZER_PYTHONPATH,
         },
     )
     return Client(transport)
@@ -133,58 +198,165 @@ async def get_pr_recommender_client():
         python_cmd="python",
         env={
             **os.environ,
-            "PYTHONPATH": str(Path("src").resolve()),
+            "PYTHONPATH": _RECOMMENDER_PYTHONPATH,
             "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY") or "dummy-key-for-tests",
         },
     )
     return Client(transport)
 
 
-async def estimate_untracked_file_size(repo_path: str, file_path: str) -> int:
-    """Estimate the size of an untracked file in lines"""
+@pytest.fixture(scope="session")
+def event_loop():
+    """Share one event loop across this module's async tests.
+
+    Overrides pytest-asyncio's function-scoped default so the long-lived
+    client fixtures below can outlive a single test.
+    """
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def analyzer_client(worker_id):
+    """One connected analyzer client per xdist worker.
+
+    Spawning the analyzer subprocess and handshaking per test dominates
+    runtime, so connect once and reuse. Depending on worker_id makes the
+    isolation explicit: every worker process talks to its own analyzer
+    subprocess and never shares a stdio pipe (worker_id is "master" when
+    xdist is disabled). Yields None when the analyzer checkout is absent
+    so tests can fall back to mock data.
+    """
     try:
-        full_path = Path(repo_path) / file_path
+        client = await get_mcp_local_repo_analyzer_client()
+    except FileNotFoundError as e:
+        print(f"⚠️  Local repo analyzer not found ({worker_id}): {e}")
+        yield None
+        return
 
-        if not full_path.exists():
-            return 0
+    async with client:
+        yield client
 
-        # Skip directories
-        if full_path.is_dir():
-            return 0
 
-        # Skip binary files based on extension
-        binary_extensions = {
-            ".pyc",
-            ".pyo",
-            ".so",
-            ".dylib",
-            ".dll",
-            ".exe",
-            ".bin",
-            ".jpg",
-            ".png",
-            ".gif",
-            ".pdf",
-        }
-        if full_path.suffix.lower() in binary_extensions:
+@pytest_asyncio.fixture(scope="session")
+async def pr_client(worker_id):
+    """One connected PR recommender client per xdist worker for the session."""
+    del worker_id  # required only to scope the server subprocess per worker
+    client = await get_pr_recommender_client()
+    async with client:
+        yield client
+
+
+# How much of a file the line counter reads before extrapolating by size
+_LINE_SAMPLE_CAP = 256 * 1024
+
+
+def _count_lines_sync(full_path: Path) -> int:
+    """Blocking part of untracked-file size estimation; runs in a worker thread."""
+    # One stat covers the existence and directory checks (exists/is_dir each
+    # issue their own system call) and provides the size for the fallback.
+    try:
+        file_stat = full_path.stat()
+    except OSError:
+        return 0
+
+    # Skip directories
+    if stat.S_ISDIR(file_stat.st_mode):
+        return 0
+
+    # Fast path: skip well-known binary extensions without opening the file
+    binary_extensions = {
+        ".pyc",
+        ".pyo",
+        ".so",
+        ".dylib",
+        ".dll",
+        ".exe",
+        ".bin",
+        ".jpg",
+        ".png",
+        ".gif",
+        ".pdf",
+    }
+    if full_path.suffix.lower() in binary_extensions:
+        return 0
+
+    # Count lines by scanning for newlines in a memory map; no decoding or
+    # per-line object allocation needed for a size estimate.
+    try:
+        size = file_stat.st_size
+        if size == 0:
             return 0
+        with open(full_path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            sample = mm[:_LINE_SAMPLE_CAP]
+
+            # Sniff the first 8 KiB for NUL bytes; catches binary files the
+            # extension set misses (no extension, unusual suffixes).
+            if b"\x00" in sample[:8192]:
+                return 0
+
+            lines = sample.count(b"\n")
+            if size > _LINE_SAMPLE_CAP:
+                # Extrapolate from the sampled prefix; an estimate does not
+                # justify scanning a huge file end to end.
+                return max(1, lines * size // _LINE_SAMPLE_CAP)
+            if sample[-1:] != b"\n":  # last line without trailing newline
+                lines += 1
+            return lines
+    except (ValueError, PermissionError, OSError):
+        # If we can't map it, estimate based on file size
+        # Rough estimate: 50 characters per line average
+        estimated_lines = max(1, file_stat.st_size // 50)
+        return min(estimated_lines, 1000)  # Cap at 1000 lines for estimation
 
-        # Try to count lines for text files
-        try:
-            with open(full_path, encoding="utf-8", errors="ignore") as f:
-                lines = sum(1 for line in f if line.strip())  # Count non-empty lines
-                return lines
-        except (UnicodeDecodeError, PermissionError):
-            # If we can't read it as text, estimate based on file size
-            file_size = full_path.stat().st_size
-            # Rough estimate: 50 characters per line average
-            estimated_lines = max(1, file_size // 50)
-            return min(estimated_lines, 1000)  # Cap at 1000 lines for estimation
 
+async def estimate_untracked_file_size(repo_path: str, file_path: str) -> int:
+    """Estimate the size of an untracked file in lines.
+
+    The file I/O happens in a worker thread so the event loop stays free
+    for the concurrent analyzer calls.
+    """
+    try:
+        return await asyncio.to_thread(_count_lines_sync, Path(repo_path) / file_path)
     except Exception:
         return 0
 
 
+def _parse(result) -> Any:
+    """Decode the JSON payload of a tool-call result.
+
+    Every tool call returns its data as JSON text in the first content
+    block; keeping the decode in one place means a faster parser can be
+    swapped in without touching each call site.
+    """
+    return json.loads(result[0].text)
+
+
+async def _fetch_diff_stats(analyzer_client, repo_path: str, file_path: str):
+    """Fetch real diff line counts for one file; returns (added, deleted)."""
+    try:
+        diff_result = await analyzer_client.call_tool(
+            "get_file_diff",
+            {
+                "file_path": file_path,
+                "repository_path": repo_path,
+                "staged": False,
+                "max_lines": 50,
+            },
+        )
+        diff_data = _parse(diff_result)
+
+        if diff_data.get("has_changes"):
+            stats = diff_data.get("statistics", {})
+            return stats.get("lines_added", 0), stats.get("lines_deleted", 0)
+    except Exception as e:
+        print(f"      ⚠️  Could not get diff for {file_path}: {e}")
+    return 0, 0
+
+
 async def get_comprehensive_file_analysis(
     analyzer_client, repo_path: str
 ) -> dict[str, Any]:
@@ -195,65 +367,67 @@ async def get_comprehensive_file_analysis(
         "analyze_working_directory",
         {"repository_path": repo_path, "include_diffs": False},
     )
-    wd_data = json.loads(wd_result[0].text)
+    wd_data = _parse(wd_result)
 
     # Get staged changes
     staged_result = await analyzer_client.call_tool(
         "analyze_staged_changes", {"repository_path": repo_path, "include_diffs": False}
     )
-    staged_data = json.loads(staged_result[0].text)
+    staged_data = _parse(staged_result)
 
     # ENHANCED: Get detailed untracked file analysis
     untracked_result = await analyzer_client.call_tool(
         "get_untracked_files", {"repository_path": repo_path}
     )
-    untracked_data = json.loads(untracked_result[0].text)
+    untracked_data = _parse(untracked_result)
 
     all_files = []
 
     # Process tracked files (modified, added, deleted, etc.)
+    tracked_objs = []
     for category in ["modified", "added", "deleted", "renamed"]:
         if category in wd_data.get("files", {}):
-            for file_obj in wd_data["files"][category]:
-                # Get real diff stats for files with changes
-                real_lines_added = 0
-                real_lines_deleted = 0
-
-                if file_obj.get("status") in ["M", "A"] and not file_obj.get(
-                    "is_binary", False
-                ):
-                    try:
-                        diff_result = await analyzer_client.call_tool(
-                            "get_file_diff",
-                            {
-                                "file_path": file_obj.get("path"),
-                                "repository_path": repo_path,
-                                "staged": False,
-                                "max_lines": 50,
-                            },
-                        )
-                        diff_data = json.loads(diff_result[0].text)
-
-                        if diff_data.get("has_changes"):
-                            stats = diff_data.get("statistics", {})
-                            real_lines_added = stats.get("lines_added", 0)
-                            real_lines_deleted = stats.get("lines_deleted", 0)
-                    except Exception as e:
-                        print(
-                            f"      ⚠️  Could not get diff for {file_obj.get('path')}: {e}"
-                        )
-
-                normalized_file = {
-                    "path": file_obj.get("path"),
-                    "status_code": file_obj.get("status", "?"),
-                    "staged": file_obj.get("staged", False),
-                    "lines_added": real_lines_added,
-                    "lines_deleted": real_lines_deleted,
-                    "is_binary": file_obj.get("is_binary", False),
-                    "old_path": file_obj.get("old_path"),
-                    "file_type": "tracked",
-                }
-                all_files.append(normalized_file)
+            tracked_objs.extend(wd_data["files"][category])
+
+    # Fetch real diff stats for eligible files concurrently; each diff is an
+    # independent round trip to the analyzer, so awaiting them one by one
+    # serializes the whole analysis on subprocess latency. Files whose stats
+    # the analyzer already reported skip the round trip entirely.
+    async def _indexed_diff(index, file_path):
+        return index, await _fetch_diff_stats(analyzer_client, repo_path, file_path)
+
+    diff_stats = {}
+    pending = []
+    for index, file_obj in enumerate(tracked_objs):
+        # Pull each field out once; the same keys are read several times below
+        lines_added = file_obj.get("lines_added")
+        lines_deleted = file_obj.get("lines_deleted")
+        status = file_obj.get("status")
+        is_binary = file_obj.get("is_binary", False)
+
+        if lines_added is not None or lines_deleted is not None:
+            diff_stats[index] = (lines_added or 0, lines_deleted or 0)
+        elif status in ["M", "A"] and not is_binary:
+            pending.append(_indexed_diff(index, file_obj.get("path")))
+
+    for future in asyncio.as_completed(pending):
+        index, stats = await future
+        diff_stats[index] = stats
+
+    for index, file_obj in enumerate(tracked_objs):
+        real_lines_added, real_lines_deleted = diff_stats.get(index, (0, 0))
+
+        normalized_file = {
+            "path": file_obj.get("path"),
+            "status_code": file_obj.get("status", "?"),
+            "staged": file_obj.get("staged", False),
+            "lines_added": real_lines_added,
+            "lines_deleted": real_lines_deleted,
+            "is_binary": file_obj.get("is_binary", False),
+            "old_path": file_obj.get("old_path"),
+            "file_type": "tracked",
+        }
+        all_files.append(normalized_file)
 
     # ENHANCED: Process untracked files with size estimation
     untracked_count = untracked_data.get("untracked_count", 0)
@@ -299,15 +473,24 @@ async def get_comprehensive_file_analysis(
         }
         all_files.append(normalized_file)
 
-    # Summary stats
-    tracked_files = [f for f in all_files if f["file_type"] == "tracked"]
-    untracked_files = [f for f in all_files if f["file_type"] == "untracked"]
-    staged_files = [f for f in all_files if f["file_type"] == "staged"]
+    # Summary stats, accumulated in a single pass instead of five traversals
+    tracked_files = []
+    untracked_files = []
+    staged_files = []
+    buckets = {
+        "tracked": tracked_files,
+        "untracked": untracked_files,
+        "staged": staged_files,
+    }
+    files_with_changes = 0
+    total_new_lines = 0
 
-    files_with_changes = [
-        f for f in all_files if f["lines_added"] > 0 or f["lines_deleted"] > 0
-    ]
-    total_new_lines = sum(f["lines_added"] for f in all_files)
+    for f in all_files:
+        buckets[f["file_type"]].append(f)
+        lines_added = f["lines_added"]
+        if lines_added > 0 or f["lines_deleted"] > 0:
+            files_with_changes += 1
+        total_new_lines += lines_added
 
     print("   📊 Comprehensive analysis:")
     print(f"      • Tracked files: {len(tracked_files)}")
@@ -315,7 +498,7 @@ async def get_comprehensive_file_analysis(
         f"      • Untracked files: {len(untracked_files)} ({total_untracked_lines:,} estimated lines)"
     )
     print(f"      • Staged files: {len(staged_files)}")
-    print(f"      • Files with changes: {len(files_with_changes)}")
+    print(f"      • Files with changes: {files_with_changes}")
     print(f"      • Total new lines: {total_new_lines:,}")
 
     return {
@@ -327,74 +510,87 @@ async def get_comprehensive_file_analysis(
             "tracked_count": len(tracked_files),
             "untracked_count": len(untracked_files),
             "staged_count": len(staged_files),
-            "files_with_changes": len(files_with_changes),
+            "files_with_changes": files_with_changes,
             "total_new_lines": total_new_lines,
             "untracked_lines": total_untracked_lines,
         },
     }
 
 
-async def discover_analyzer_capabilities():
+async def discover_analyzer_capabilities(analyzer_client):
     """Discover all available tools and their parameters from the analyzer."""
     print("🔍 Discovering mcp_local_repo_analyzer capabilities...")
 
     try:
-        analyzer_client = await get_mcp_local_repo_analyzer_client()
+        # List available tools (client is already connected)
+        tools = await analyzer_client.list_tools()
+        print(f"\n📋 Found {len(tools)} available tools:")
+
+        tool_info = {}
+        output = []  # buffered and written once; one print per line is slow
+        for tool in tools:
+            tool_name = getattr(tool, "name", "Unknown")
+            tool_desc = getattr(tool, "description", "No description")
+
+            # Extract parameters if available
+            params = {}
+            if hasattr(tool, "input_schema") and tool.input_schema:
+                schema = tool.input_schema
+                if "properties" in schema:
+                    for param_name, param_info in schema["properties"].items():
+                        params[param_name] = {
+                            "type": param_info.get("type", "unknown"),
+                            "description": param_info.get(
+                                "description", "No description"
+                            ),
+                            "default": param_info.get("default"),
+                            "required": param_name in schema.get("required", []),
+                        }
+
+            tool_info[tool_name] = {"description": tool_desc, "parameters": params}
+
+            output.append(f"\n  🔧 {tool_name}")
+            output.append(f"     📝 {tool_desc}")
+            if params:
+                output.append(f"     📊 Parameters ({len(params)}):")
+                for param_name, param_data in params.items():
+                    required_str = " (required)" if param_data["required"] else ""
+                    default_str = (
+                        f" [default: {param_data['default']}]"
+                        if param_data["default"] is not None
+                        else ""
+                    )
+                    output.append(
+                        f"       • {param_name}: {param_data['type']}{required_str}{default_str}"
+                    )
+                    output.append(f"         {param_data['description']}")
 
-        async with analyzer_client:
-            print("✅ Connected to Local Repo Analyzer")
-
-            # List available tools
-            tools = await analyzer_client.list_tools()
-            print(f"\n📋 Found {len(tools)} available tools:")
-
-            tool_info = {}
-            for tool in tools:
-                tool_name = getattr(tool, "name", "Unknown")
-                tool_desc = getattr(tool, "description", "No description")
-
-                # Extract parameters if available
-                params = {}
-                if hasattr(tool, "input_schema") and tool.input_schema:
-                    schema = tool.input_schema
-                    if "properties" in schema:
-                        for param_name, param_info in schema["properties"].items():
-                            params[param_name] = {
-                                "type": param_info.get("type", "unknown"),
-                                "description": param_info.get(
-                                    "description", "No description"
-                                ),
-                                "default": param_info.get("default"),
-                                "required": param_name in schema.get("required", []),
-                            }
-
-                tool_info[tool_name] = {"description": tool_desc, "parameters": params}
-
-                print(f"\n  🔧 {tool_name}")
-                print(f"     📝 {tool_desc}")
-                if params:
-                    print(f"     📊 Parameters ({len(params)}):")
-                    for param_name, param_data in params.items():
-                        required_str = " (required)" if param_data["required"] else ""
-                        default_str = (
-                            f" [default: {param_data['default']}]"
-                            if param_data["default"] is not None
-                            else ""
-                        )
-                        print(
-                            f"       • {param_name}: {param_data['type']}{required_str}{default_str}"
-                        )
-                        print(f"         {param_data['description']}")
-
-            return tool_info
+        if output:
+            print("\n".join(output))
+
+        return tool_info
 
     except Exception as e:
         print(f"❌ Failed to discover analyzer capabilities: {e}")
         return {}
 
 
+@pytest_asyncio.fixture(scope="module")
+async def analyzer_capabilities(analyzer_client):
+    """Discovered analyzer tool metadata, computed once per module.
+
+    Discovery walks every tool schema and is read-only, so there is no
+    reason to repeat it per test.
+    """
+    if analyzer_client is None:
+        return {}
+    return await discover_analyzer_capabilities(analyzer_client)
+
+
 @pytest.mark.unit
-async def test_messy_developer_workflow(analysis_data: dict[str, Any]):
+async def test_messy_developer_workflow(
+    analysis_data: AnalysisData, analyzer_client, pr_client
+):
     """Test the complete workflow for a messy developer scenario."""
     print("\n🎯 Testing 'Messy Developer' Workflow...")
     print("=" * 60)
@@ -403,10 +599,12 @@ async def test_messy_developer_workflow(analysis_data: dict[str, Any]):
     has_outstanding_work = analysis_data.get("has_outstanding_work", False)
     total_changes = analysis_data.get("total_outstanding_changes", 0)
     risk_level = analysis_data.get("risk_assessment", {}).get("risk_level", "low")
-    quick_stats = analysis_data.get("quick_stats", {})
+    quick_stats: QuickStats = analysis_data.get("quick_stats", {})
 
     # Enhanced stats including untracked files
-    comprehensive_stats = analysis_data.get("comprehensive_stats", {})
+    comprehensive_stats: ComprehensiveStats = analysis_data.get(
+        "comprehensive_stats", {}
+    )
     untracked_count = comprehensive_stats.get("untracked_count", 0)
     untracked_lines = comprehensive_stats.get("untracked_lines", 0)
 
@@ -427,59 +625,55 @@ async def test_messy_developer_workflow(analysis_data: dict[str, Any]):
         print("✅ Repository is clean - no workflow needed")
         return True
 
-    # Connect to both servers
-    try:
-        analyzer_client = await get_mcp_local_repo_analyzer_client()
-        pr_client = await get_pr_recommender_client()
+    if analyzer_client is None:
+        print("❌ Workflow test failed: analyzer unavailable")
+        return False
 
-        async with analyzer_client, pr_client:
-            print(f"\n🔀 Routing workflow based on risk level: {risk_level}")
+    # Clients are already connected by the module-scoped fixtures
+    try:
+        print(f"\n🔀 Routing workflow based on risk level: {risk_level}")
 
-            if risk_level == "high":
-                await _handle_high_risk_workflow(
-                    analyzer_client, pr_client, analysis_data
-                )
-            elif (
-                quick_stats.get("working_directory_changes", 0) > 0
-                or untracked_count > 0
-            ):
-                await _handle_working_directory_workflow(
-                    analyzer_client, pr_client, analysis_data
-                )
-            elif quick_stats.get("unpushed_commits", 0) > 0:
-                await _handle_unpushed_commits_workflow(
-                    analyzer_client, pr_client, analysis_data
-                )
-            else:
-                await _handle_default_workflow(
-                    analyzer_client, pr_client, analysis_data
-                )
+        if risk_level == "high":
+            await _handle_high_risk_workflow(analyzer_client, pr_client, analysis_data)
+        elif quick_stats.get("working_directory_changes", 0) > 0 or untracked_count > 0:
+            await _handle_working_directory_workflow(
+                analyzer_client, pr_client, analysis_data
+            )
+        elif quick_stats.get("unpushed_commits", 0) > 0:
+            await _handle_unpushed_commits_workflow(
+                analyzer_client, pr_client, analysis_data
+            )
+        else:
+            await _handle_default_workflow(analyzer_client, pr_client, analysis_data)
 
-            # Finally, get PR recommendations with enhanced data
-            await _generate_pr_recommendations(pr_client, analysis_data)
+        # Finally, get PR recommendations with enhanced data
+        await _generate_pr_recommendations(pr_client, analysis_data)
 
-            return True
+        return True
 
     except Exception as e:
         print(f"❌ Workflow test failed: {e}")
         return False
 
 
-async def _handle_high_risk_workflow(analyzer_client, pr_client, analysis_data):
+async def _handle_high_risk_workflow(
+    analyzer_client, pr_client, analysis_data: AnalysisData
+):
     """Handle high-risk scenario workflow."""
     print("\n⚠️  HIGH RISK WORKFLOW")
     print("   Performing comprehensive validation...")
 
     repo_path = analysis_data.get("repository_path", ".")
+    quick_stats: QuickStats = analysis_data.get("quick_stats", {})
 
     try:
         # Validate staged changes if any
-        if analysis_data.get("quick_stats", {}).get("staged_changes", 0) > 0:
+        if quick_stats.get("staged_changes", 0) > 0:
             print("   🔍 Validating staged changes...")
             validation_result = await analyzer_client.call_tool(
                 "validate_staged_changes", {"repository_path": repo_path}
             )
-            validation_data = json.loads(validation_result[0].text)
+            validation_data = _parse(validation_result)
             print(
                 f"   ✅ Validation result: {'VALID' if validation_data.get('valid') else 'INVALID'}"
             )
@@ -492,7 +686,7 @@ async def _handle_high_risk_workflow(analyzer_client, pr_client, analysis_data):
         conflicts_result = await analyzer_client.call_tool(
             "detect_conflicts", {"repository_path": repo_path, "target_branch": "main"}
         )
-        conflicts_data = json.loads(conflicts_result[0].text)
+        conflicts_data = _parse(conflicts_result)
 
         if conflicts_data.get("has_potential_conflicts"):
             conflict_files = conflicts_data.get("potential_conflict_files", [])
@@ -506,13 +700,17 @@ async def _handle_high_risk_workflow(analyzer_client, pr_client, analysis_data):
         print(f"   ❌ High-risk workflow error: {e}")
 
 
-async def _handle_working_directory_workflow(analyzer_client, pr_client, analysis_data):
+async def _handle_working_directory_workflow(
+    analyzer_client, pr_client, analysis_data: AnalysisData
+):
     """Handle working directory changes workflow."""
     print("\n📝 WORKING DIRECTORY WORKFLOW")
     print("   Analyzing uncommitted changes for PR grouping...")
 
     repo_path = analysis_data.get("repository_path", ".")
-    comprehensive_stats = analysis_data.get("comprehensive_stats", {})
+    comprehensive_stats: ComprehensiveStats = analysis_data.get(
+        "comprehensive_stats", {}
+    )
 
     try:
         # Get detailed working directory analysis
@@ -520,7 +718,7 @@ async def _handle_working_directory_workflow(analyzer_client, pr_client, analysi
             "analyze_working_directory",
             {"repository_path": repo_path, "include_diffs": False},
         )
-        wd_data = json.loads(wd_result[0].text)
+        wd_data = _parse(wd_result)
 
         print("   📊 Working directory summary:")
         summary = wd_data.get("summary", {})
@@ -542,7 +740,7 @@ async def _handle_working_directory_workflow(analyzer_client, pr_client, analysi
             untracked_result = await analyzer_client.call_tool(
                 "get_untracked_files", {"repository_path": repo_path}
             )
-            untracked_data = json.loads(untracked_result[0].text)
+            untracked_data = _parse(untracked_result)
             print(
                 f"   📁 Found {untracked_data.get('untracked_count', 0)} untracked files"
             )
@@ -562,7 +760,9 @@ async def _handle_working_directory_workflow(analyzer_client, pr_client, analysi
         print(f"   ❌ Working directory workflow error: {e}")
 
 
-async def _handle_unpushed_commits_workflow(analyzer_client, pr_client, analysis_data):
+async def _handle_unpushed_commits_workflow(
+    analyzer_client, pr_client, analysis_data: AnalysisData
+):
     """Handle unpushed commits workflow."""
     print("\n🚀 UNPUSHED COMMITS WORKFLOW")
     print("   Checking push readiness...")
@@ -574,7 +774,7 @@ async def _handle_unpushed_commits_workflow(analyzer_client, pr_client, analysis
         push_result = await analyzer_client.call_tool(
             "get_push_readiness", {"repository_path": repo_path}
         )
-        push_data = json.loads(push_result[0].text)
+        push_data = _parse(push_result)
 
         ready_to_push = push_data.get("ready_to_push", False)
         print(f"   ✅ Push ready: {ready_to_push}")
@@ -591,7 +791,7 @@ async def _handle_unpushed_commits_workflow(analyzer_client, pr_client, analysis
             "compare_with_remote",
             {"remote_name": "origin", "repository_path": repo_path},
         )
-        remote_data = json.loads(remote_result[0].text)
+        remote_data = _parse(remote_result)
 
         sync_status = remote_data.get("sync_status", "unknown")
         print(f"   📊 Sync status: {sync_status}")
@@ -605,7 +805,9 @@ async def _handle_unpushed_commits_workflow(analyzer_client, pr_client, analysis
         print(f"   ❌ Unpushed commits workflow error: {e}")
 
 
-async def _handle_default_workflow(analyzer_client, pr_client, analysis_data):
+async def _handle_default_workflow(
+    analyzer_client, pr_client, analysis_data: AnalysisData
+):
     """Handle default workflow for other scenarios."""
     print("\n🔄 DEFAULT WORKFLOW")
     print("   Running repository health check...")
@@ -616,7 +818,7 @@ async def _handle_default_workflow(analyzer_client, pr_client, analysis_data):
         health_result = await analyzer_client.call_tool(
             "analyze_repository_health", {"repository_path": repo_path}
         )
-        health_data = json.loads(health_result[0].text)
+        health_data = _parse(health_result)
 
         health_score = health_data.get("health_score", 0)
         health_status = health_data.get("health_status", "unknown")
@@ -635,6 +837,20 @@ async def _handle_default_workflow(analyzer_client, pr_client, analysis_data):
         print(f"   ❌ Default workflow error: {e}")
 
 
+# Compiled once; the categorization loop below runs per file of every
+# recommended PR, so substring scans over rebuilt pattern lists add up.
+_NEW_FILE_RE = re.compile(
+    "|".join(map(re.escape, ("src/pr_recommender/", "tests/", "Makefile")))
+)
+_CONFIG_FILE_RE = re.compile(
+    "|".join(map(re.escape, ("pyproject.toml", "poetry.lock", ".env", ".gitignore")))
+)
+
+# First line of a description that is not blank, a markdown heading, or a
+# bold marker — found in one C-level search instead of a Python loop.
+_FIRST_CONTENT_LINE = re.compile(r"^(?!\s*$|#|\*\*).+", re.MULTILINE)
+
+
 async def _generate_pr_recommendations(pr_client, analysis_data):
     """Enhanced PR generation that includes untracked files"""
     print("\n🤖 GENERATING PR RECOMMENDATIONS")
@@ -646,32 +862,33 @@ async def _generate_pr_recommendations(pr_client, analysis_data):
             "generate_pr_recommendations", {"analysis_data": analysis_data}
         )
 
-        pr_data = json.loads(result[0].text)
+        pr_data = _parse(result)
         print("   ✅ PR recommendations generated")
 
-        # Enhanced display
+        # Enhanced display; buffer the per-PR lines and write them in one go
+        # instead of flushing stdout once per line inside the loop.
         recommendations = pr_data.get("recommendations", [])
         if recommendations:
-            print(f"\n  📋 Found {len(recommendations)} PR recommendations:\n")
+            output = [f"\n  📋 Found {len(recommendations)} PR recommendations:\n"]
 
             for i, rec in enumerate(recommendations, 1):
-                print(f"  📝 PR #{i}:")
-                print(f"    📌 Title: {rec.get('title', 'No title')}")
+                output.append(f"  📝 PR #{i}:")
+                output.append(f"    📌 Title: {rec.get('title', 'No title')}")
 
-                # Show enhanced description with first few lines
+                # Show enhanced description with first few lines; islice
+                # iterates the first four without copying a slice
                 description = rec.get("description", "")
                 if description:
-                    # Extract first line or two for preview
-                    desc_lines = description.split("\n")
                     preview_lines = []
-                    for line in desc_lines[:4]:  # First 4 lines
-                        if line.strip() and not line.startswith("#"):
-                            preview_lines.append(line.strip())
+                    for line in islice(description.splitlines(), 4):
+                        stripped = line.strip()
+                        if stripped and not line.startswith("#"):
+                            preview_lines.append(stripped)
 
                     if preview_lines:
-                        print(f"    📄 Description: {preview_lines[0]}")
+                        output.append(f"    📄 Description: {preview_lines[0]}")
                         if len(preview_lines) > 1:
-                            print(f"                   {preview_lines[1]}")
+                            output.append(f"                   {preview_lines[1]}")
 
                 files = rec.get("files", [])
                 total_lines = rec.get("total_lines_changed", 0)
@@ -683,44 +900,35 @@ async def _generate_pr_recommendations(pr_client, analysis_data):
                 test_in_pr = 0
 
                 for f in files:
-                    if any(
-                        pattern in f
-                        for pattern in ["src/pr_recommender/", "tests/", "Makefile"]
-                    ):
+                    if _NEW_FILE_RE.search(f):
                         if "test" in f.lower():
                             test_in_pr += 1
                         elif f.endswith((".py", ".js", ".ts")):
                             source_in_pr += 1
                         untracked_in_pr += 1
-                    elif any(
-                        cfg in f
-                        for cfg in [
-                            "pyproject.toml",
-                            "poetry.lock",
-                            ".env",
-                            ".gitignore",
-                        ]
-                    ):
+                    elif _CONFIG_FILE_RE.search(f):
                         config_in_pr += 1
 
                 # Show file type breakdown
                 if untracked_in_pr > 0:
-                    print(
+                    output.append(
                         f"    🆕 New files: {untracked_in_pr} ({source_in_pr} source, {test_in_pr} tests)"
                     )
                 if config_in_pr > 0:
-                    print(f"    ⚙️  Config files: {config_in_pr}")
+                    output.append(f"    ⚙️  Config files: {config_in_pr}")
 
-                print(f"    📊 Total: {len(files)} files, {total_lines:,} lines changed")
-                print(f"    ⚡ Priority: {rec.get('priority', 'unknown')}")
-                print(f"    ⚠️  Risk: {rec.get('risk_level', 'unknown')}")
+                output.append(
+                    f"    📊 Total: {len(files)} files, {total_lines:,} lines changed"
+                )
+                output.append(f"    ⚡ Priority: {rec.get('priority', 'unknown')}")
+                output.append(f"    ⚠️  Risk: {rec.get('risk_level', 'unknown')}")
 
                 reasoning = rec.get("reasoning", "")
                 if reasoning:
-                    # Show short reasoning
-                    short_reasoning = reasoning.split(".")[0]  # First sentence
-                    print(f"    💭 Reasoning: {short_reasoning}")
-                print()
+                    # Show short reasoning; partition stops at the first "."
+                    short_reasoning = reasoning.partition(".")[0]  # First sentence
+                    output.append(f"    💭 Reasoning: {short_reasoning}")
+                output.append("")
 
             # Enhanced summary
             total_files = sum(len(rec.get("files", [])) for rec in recommendations)
@@ -728,105 +936,103 @@ async def _generate_pr_recommendations(pr_client, analysis_data):
                 rec.get("total_lines_changed", 0) for rec in recommendations
             )
 
-            print(
+            output.append(
                 f"  📊 Summary: Generated {len(recommendations)} atomic PRs from {total_files} files ({total_lines:,} total lines)"
             )
+            print("\n".join(output))
 
     except Exception as e:
         print(f"   ❌ PR recommendation error: {e}")
-        import traceback
-
         traceback.print_exc()
 
 
 @pytest.mark.unit
-async def test_full_integration():
+async def test_full_integration(analyzer_client, pr_client, analyzer_capabilities):
     """Test full integration: analyzer -> recommender with comprehensive workflow."""
     print("🔗 Testing Full Integration (Analyzer -> Recommender)")
     print("🎯 Focus: 'Messy Developer' Scenario with Untracked Files")
     print("=" * 80)
 
+    if analyzer_client is None:
+        print("⚠️  Local repo analyzer not available")
+        print("💡 Falling back to mock data test...")
+        return await test_pr_recommender_with_mock(pr_client)
+
     try:
-        # Step 1: Discover analyzer capabilities
-        tool_info = await discover_analyzer_capabilities()
+        # Step 1: Analyzer capabilities (discovered once by the fixture)
+        tool_info = analyzer_capabilities
 
         if not tool_info:
             print(
                 "⚠️  Could not discover analyzer capabilities, proceeding with mock data..."
             )
-            return await test_pr_recommender_with_mock()
+            return await test_pr_recommender_with_mock(pr_client)
 
-        # Step 2: Get comprehensive analysis
+        # Step 2: Get comprehensive analysis (client already connected by fixture)
         print("\n📊 Step 2: Getting comprehensive repository analysis...")
-        analyzer_client = await get_mcp_local_repo_analyzer_client()
 
-        async with analyzer_client:
-            print("✅ Connected to Local Repo Analyzer")
+        # Get outstanding summary with detailed analysis
+        analysis_result = await analyzer_client.call_tool(
+            "get_outstanding_summary", {"repository_path": ".", "detailed": True}
+        )
+
+        # Extract analysis data
+        analysis_data = _parse(analysis_result)
+
+        print("📋 Analysis completed:")
+        print(f"   • Repository: {analysis_data.get('repository_name', 'Unknown')}")
+        print(f"   • Branch: {analysis_data.get('current_branch', 'Unknown')}")
+        print(
+            f"   • Outstanding changes: {analysis_data.get('total_outstanding_changes', 0)}"
+        )
+        print(
+            f"   • Risk level: {analysis_data.get('risk_assessment', {}).get('risk_level', 'unknown')}"
+        )
 
-            # Get outstanding summary with detailed analysis
-            analysis_result = await analyzer_client.call_tool(
-                "get_outstanding_summary", {"repository_path": ".", "detailed": True}
+        # Step 2.5: Get comprehensive file details including untracked files
+        if analysis_data.get("has_outstanding_work"):
+            print(
+                "\n📁 Step 2.5: Getting comprehensive file information (including untracked files)..."
             )
 
-            # Extract analysis data
-            analysis_data = json.loads(analysis_result[0].text)
+            # Get comprehensive analysis that includes untracked files
+            comprehensive_analysis = await get_comprehensive_file_analysis(
+                analyzer_client, "."
+            )
 
-            print("📋 Analysis completed:")
-            print(f"   • Repository: {analysis_data.get('repository_name', 'Unknown')}")
-            print(f"   • Branch: {analysis_data.get('current_branch', 'Unknown')}")
+            # ENHANCED: Merge comprehensive analysis into the main analysis data
+            analysis_data["all_files"] = comprehensive_analysis["all_files"]
+            analysis_data["working_directory_files"] = comprehensive_analysis[
+                "working_directory_files"
+            ]
+            analysis_data["staged_files"] = comprehensive_analysis["staged_files"]
+            analysis_data["untracked_files"] = comprehensive_analysis["untracked_files"]
+            analysis_data["comprehensive_stats"] = comprehensive_analysis["stats"]
+
+            # Update total changes to include untracked files
+            original_changes = analysis_data.get("total_outstanding_changes", 0)
+            untracked_lines = comprehensive_analysis["stats"]["untracked_lines"]
+            total_changes_including_untracked = original_changes + untracked_lines
+            analysis_data[
+                "total_outstanding_changes"
+            ] = total_changes_including_untracked
+
+            print("   ✅ Enhanced analysis complete:")
             print(
-                f"   • Outstanding changes: {analysis_data.get('total_outstanding_changes', 0)}"
+                f"      • Tracked files: {comprehensive_analysis['stats']['tracked_count']}"
             )
             print(
-                f"   • Risk level: {analysis_data.get('risk_assessment', {}).get('risk_level', 'unknown')}"
+                f"      • Untracked files: {comprehensive_analysis['stats']['untracked_count']}"
             )
-
-            # Step 2.5: Get comprehensive file details including untracked files
-            if analysis_data.get("has_outstanding_work"):
-                print(
-                    "\n📁 Step 2.5: Getting comprehensive file information (including untracked files)..."
-                )
-
-                # Get comprehensive analysis that includes untracked files
-                comprehensive_analysis = await get_comprehensive_file_analysis(
-                    analyzer_client, "."
-                )
-
-                # ENHANCED: Merge comprehensive analysis into the main analysis data
-                analysis_data["all_files"] = comprehensive_analysis["all_files"]
-                analysis_data["working_directory_files"] = comprehensive_analysis[
-                    "working_directory_files"
-                ]
-                analysis_data["staged_files"] = comprehensive_analysis["staged_files"]
-                analysis_data["untracked_files"] = comprehensive_analysis[
-                    "untracked_files"
-                ]
-                analysis_data["comprehensive_stats"] = comprehensive_analysis["stats"]
-
-                # Update total changes to include untracked files
-                original_changes = analysis_data.get("total_outstanding_changes", 0)
-                untracked_lines = comprehensive_analysis["stats"]["untracked_lines"]
-                total_changes_including_untracked = original_changes + untracked_lines
-                analysis_data[
-                    "total_outstanding_changes"
-                ] = total_changes_including_untracked
-
-                print("   ✅ Enhanced analysis complete:")
-                print(
-                    f"      • Tracked files: {comprehensive_analysis['stats']['tracked_count']}"
-                )
-                print(
-                    f"      • Untracked files: {comprehensive_analysis['stats']['untracked_count']}"
-                )
-                print(
-                    f"      • Staged files: {comprehensive_analysis['stats']['staged_count']}"
-                )
-                print(
-                    f"      • Total impact: {total_changes_including_untracked:,} lines"
-                )
+            print(
+                f"      • Staged files: {comprehensive_analysis['stats']['staged_count']}"
+            )
+            print(f"      • Total impact: {total_changes_including_untracked:,} lines")
 
         # Step 3: Execute enhanced messy developer workflow
-        success = await test_messy_developer_workflow(analysis_data)
+        success = await test_messy_developer_workflow(
+            analysis_data, analyzer_client, pr_client
+        )
 
         if success:
             print("\n🎉 Full integration test completed successfully!")
@@ -836,100 +1042,97 @@ async def test_full_integration():
             print("\n❌ Integration test had issues")
             return False
 
-    except FileNotFoundError as e:
-        print(f"⚠️  Local repo analyzer not found: {e}")
-        print("💡 Falling back to mock data test...")
-        return await test_pr_recommender_with_mock()
     except Exception as e:
         print(f"❌ Integration test failed: {e}")
-        import traceback
-
         traceback.print_exc()
         return False
 
 
 @pytest.mark.unit
-async def test_pr_recommender_with_mock():
+async def test_pr_recommender_with_mock(pr_client):
     """Test PR recommender with mock data."""
     print("🧪 Testing PR Recommender with mock data...")
 
-    client = await get_pr_recommender_client()
+    try:
+        print("✅ Connected to PR Recommender server")
+
+        # List available tools
+        tools = await pr_client.list_tools()
+        print(f"\n📋 Available tools ({len(tools)}):")
+        for tool in tools:
+            tool_name = getattr(tool, "name", "Unknown")
+            tool_desc = getattr(tool, "description", "No description")
+            print(f"  - {tool_name}: {tool_desc}")
+
+        # Test PR recommendation with mock data
+        print("\n🤖 Testing PR recommendation with mock data...")
+        result = await pr_client.call_tool(
+            "generate_pr_recommendations", {"analysis_data": _mock_analysis()}
+        )
 
-    async with client:
-        try:
-            print("✅ Connected to PR Recommender server")
-
-            # List available tools
-            tools = await client.list_tools()
-            print(f"\n📋 Available tools ({len(tools)}):")
-            for tool in tools:
-                tool_name = getattr(tool, "name", "Unknown")
-                tool_desc = getattr(tool, "description", "No description")
-                print(f"  - {tool_name}: {tool_desc}")
-
-            # Test PR recommendation with mock data
-            print("\n🤖 Testing PR recommendation with mock data...")
-            result = await client.call_tool(
-                "generate_pr_recommendations", {"analysis_data": MOCK_ANALYSIS}
-            )
+        pr_data = _parse(result)
+        print("✅ PR Recommendation Result:")
+        print_pr_recommendations(pr_data)
 
-            pr_data = json.loads(result[0].text)
-            print("✅ PR Recommendation Result:")
-            print_pr_recommendations(pr_data)
+        return True
 
-            return True
+    except Exception as e:
+        print(f"❌ Error testing PR recommender: {e}")
+        traceback.print_exc()
+        return False
 
-        except Exception as e:
-            print(f"❌ Error testing PR recommender: {e}")
-            import traceback
 
-            traceback.print_exc()
-            return False
+def print_pr_recommendations(result):
+    """Print PR recommendation results in a nice format.
 
+    Lines are buffered and written in one call so the per-line print
+    overhead does not dominate large recommendation sets. When
+    PR_RECO_QUIET is set (pytest does this while capturing output) the
+    formatting is skipped entirely.
+    """
+    if os.environ.get("PR_RECO_QUIET"):
+        return
+
+    out = []
+    _a = out.append
 
-def print_pr_recommendations(result):
-    """Print PR recommendation results in a nice format."""
     if isinstance(result, dict):
         if "error" in result:
-            print(f"  ❌ Error: {result['error']}")
+            print(f"  \u274c Error: {result['error']}")
             return
 
         # Print main recommendations
         if "recommendations" in result:
             recommendations = result["recommendations"]
             if isinstance(recommendations, list) and recommendations:
-                print(f"\n  📋 Found {len(recommendations)} PR recommendations:")
+                _a(f"\n  \U0001f4cb Found {len(recommendations)} PR recommendations:")
 
                 for i, rec in enumerate(recommendations, 1):
-                    print(f"\n  📝 PR #{i}:")
+                    _a(f"\n  \U0001f4dd PR #{i}:")
 
                     if isinstance(rec, dict):
                         # Print PR details
                         if "title" in rec:
-                            print(f"    📌 Title: {rec['title']}")
+                            _a(f"    \U0001f4cc Title: {rec['title']}")
                         if "description" in rec:
-                            # Show condensed description
-                            desc = rec["description"]
-                            lines = desc.split("\n")
-                            # Find the first meaningful line
-                            for line in lines:
-                                if (
-                                    line.strip()
-                                    and not line.startswith("#")
-                                    and not line.startswith("**")
-                                ):
-                                    print(f"    📄 Description: {line.strip()}")
-                                    break
+                            # Show condensed description: first meaningful line
+                            match = _FIRST_CONTENT_LINE.search(rec["description"])
+                            if match:
+                                _a(
+                                    f"    \U0001f4c4 Description: {match.group().strip()}"
+                                )
                         if "priority" in rec:
-                            print(f"    ⚡ Priority: {rec['priority']}")
+                            _a(f"    \u26a1 Priority: {rec['priority']}")
                         if "risk_level" in rec:
-                            print(f"    ⚠️  Risk: {rec['risk_level']}")
+                            _a(f"    \u26a0\ufe0f  Risk: {rec['risk_level']}")
 
                         # Enhanced file information
                         if "files" in rec:
                             files = rec["files"]
                             total_lines = rec.get("total_lines_changed", 0)
-                            print(f"    📊 Files: {len(files)}, Lines: {total_lines:,}")
+                            _a(
+                                f"    \U0001f4ca Files: {len(files)}, Lines: {total_lines:,}"
+                            )
 
                             # Categorize files
                             new_files = [
@@ -963,68 +1166,100 @@ def print_pr_recommendations(result):
                             ]
 
                             if new_files:
-                                print(f"    🆕 New feature files: {len(new_files)}")
+                                _a(
+                                    f"    \U0001f195 New feature files: {len(new_files)}"
+                                )
                             if config_files:
-                                print(f"    ⚙️  Config files: {len(config_files)}")
+                                _a(
+                                    f"    \u2699\ufe0f  Config files: {len(config_files)}"
+                                )
                             if other_files:
-                                print(f"    📁 Other files: {len(other_files)}")
+                                _a(f"    \U0001f4c1 Other files: {len(other_files)}")
 
                         # Print reasoning
                         if "reasoning" in rec:
                             reasoning = rec["reasoning"]
-                            # Show first sentence
-                            short_reasoning = (
-                                reasoning.split(".")[0]
-                                if "." in reasoning
-                                else reasoning
-                            )
-                            print(f"    💭 Reasoning: {short_reasoning}")
+                            # Show first sentence; whole string when there is none
+                            short_reasoning = reasoning.partition(".")[0]
+                            _a(f"    \U0001f4ad Reasoning: {short_reasoning}")
                     else:
-                        print(f"    📄 {rec}")
+                        _a(f"    \U0001f4c4 {rec}")
             else:
-                print("  📭 No specific recommendations provided")
+                _a("  \U0001f4ed No specific recommendations provided")
 
         # Print summary info
         if "summary" in result:
-            print(f"\n  📊 Summary: {result['summary']}")
+            _a(f"\n  \U0001f4ca Summary: {result['summary']}")
 
         if "total_prs" in result:
-            print(f"  🔢 Total PRs suggested: {result['total_prs']}")
+            _a(f"  \U0001f522 Total PRs suggested: {result['total_prs']}")
 
     else:
-        print(f"  📄 Result: {str(result)[:200]}...")
+        _a(f"  \U0001f4c4 Result: {str(result)[:200]}...")
+
+    if out:
+        sys.stdout.write("\n".join(out) + "\n")
 
 
 @pytest.mark.unit
-async def test_connection_only():
+async def test_connection_only(pr_client):
     """Test basic connection to PR recommender."""
     print("🔌 Testing connection to PR Recommender...")
 
-    client = await get_pr_recommender_client()
+    try:
+        await pr_client.ping()
+        print("🏓 Server ping successful")
 
-    async with client:
-        try:
-            await client.ping()
-            print("🏓 Server ping successful")
+        tools = await pr_client.list_tools()
+        print(f"🔧 Available tools: {len(tools)}")
 
-            tools = await client.list_tools()
-            print(f"🔧 Available tools: {len(tools)}")
+        for tool in tools:
+            tool_name = getattr(tool, "name", "Unknown")
+            print(f"   - {tool_name}")
 
-            for tool in tools:
-                tool_name = getattr(tool, "name", "Unknown")
-                print(f"   - {tool_name}")
+        return True
 
-            return True
+    except Exception as e:
+        print(f"❌ Connection test failed: {e}")
+        return False
 
-        except Exception as e:
-            print(f"❌ Connection test failed: {e}")
+
+async def _run_standalone(mode: str) -> bool:
+    """Run one test mode outside pytest, connecting the shared clients manually."""
+    if mode == "discover":
+        try:
+            analyzer_client = await get_mcp_local_repo_analyzer_client()
+        except FileNotFoundError as e:
+            print(f"❌ Failed to discover analyzer capabilities: {e}")
             return False
+        async with analyzer_client:
+            return bool(await discover_analyzer_capabilities(analyzer_client))
+
+    pr_client = await get_pr_recommender_client()
+
+    if mode == "connection":
+        async with pr_client:
+            return await test_connection_only(pr_client)
+
+    if mode == "mock":
+        async with pr_client:
+            return await test_pr_recommender_with_mock(pr_client)
+
+    # integration
+    try:
+        analyzer_client = await get_mcp_local_repo_analyzer_client()
+    except FileNotFoundError as e:
+        print(f"⚠️  Local repo analyzer not found: {e}")
+        async with pr_client:
+            return await test_full_integration(None, pr_client, {})
+
+    async with analyzer_client, pr_client:
+        capabilities = await discover_analyzer_capabilities(analyzer_client)
+        return await test_full_integration(analyzer_client, pr_client, capabilities)
 
 
 def main():
     """Main entry point for the test client."""
-    import argparse
-
     parser = argparse.ArgumentParser(description="Test the MCP PR Recommender server")
     parser.add_argument(
         "--mode",
@@ -1038,14 +1273,7 @@ def main():
 
     args = parser.parse_args()
 
-    if args.mode == "connection":
-        success = asyncio.run(test_connection_only())
-    elif args.mode == "integration":
-        success = asyncio.run(test_full_integration())
-    elif args.mode == "discover":
-        success = asyncio.run(discover_analyzer_capabilities()) is not None
-    else:  # mock
-        success = asyncio.run(test_pr_recommender_with_mock())
+    success = asyncio.run(_run_standalone(args.mode))
 
     sys.exit(0 if success else 1)
 
@@ -1,31 +1,31 @@
 """Comprehensive unit tests for the FeasibilityAnalyzerTool."""
 
-from unittest.mock import Mock, patch
+from types import SimpleNamespace
 
 import pytest
 
-from mcp_pr_recommender.tools.feasibility_analyzer_tool import FeasibilityAnalyzerTool
+from mcp_pr_recommender.tools.feasibility_analyzer_tool import (
+    RISK_CRITICAL_FILES,
+    RISK_LARGE_CHANGES,
+    RISK_LARGE_FILE_COUNT,
+    RISK_MIXED_FILE_TYPES,
+    FeasibilityAnalyzerTool,
+)
 
 
 @pytest.mark.unit
 class TestFeasibilityAnalyzerTool:
     """Test the FeasibilityAnalyzerTool."""
 
-    @pytest.fixture
-    def mock_settings(self):
-        """Mock settings for testing."""
-        with patch(
-            "mcp_pr_recommender.tools.feasibility_analyzer_tool.settings"
-        ) as mock_settings_func:
-            mock_settings_instance = Mock()
-            mock_settings_instance.max_files_per_pr = 8
-            mock_settings_func.return_value = mock_settings_instance
-            yield mock_settings_instance
+    @pytest.fixture(scope="session")
+    def tool(self):
+        """One tool instance shared by the whole suite.
 
-    @pytest.fixture
-    def tool(self, mock_settings):
-        """Create feasibility analyzer tool instance."""
-        return FeasibilityAnalyzerTool()
+        The tool is stateless apart from its settings stub, so there is
+        no need to rebuild it per test; tests that need a different
+        limit override it via monkeypatch.
+        """
+        return FeasibilityAnalyzerTool(settings=SimpleNamespace(max_files_per_pr=8))
 
     @pytest.fixture
     def sample_pr_simple(self):
@@ -63,10 +63,9 @@ class TestFeasibilityAnalyzerTool:
         """Test tool initialization."""
         assert tool.logger is not None
 
-    @pytest.mark.asyncio
-    async def test_analyze_feasibility_simple_pr(self, tool, sample_pr_simple):
+    def test_analyze_feasibility_simple_pr(self, tool, sample_pr_simple):
         """Test feasibility analysis for simple PR."""
-        result = await tool.analyze_feasibility(sample_pr_simple)
+        result = tool.analyze_feasibility(sample_pr_simple)
 
         assert "feasible" in result
         assert result["feasible"] is True
@@ -78,10 +77,9 @@ class TestFeasibilityAnalyzerTool:
         assert "dependency_analysis" in result
         assert "review_checklist" in result
 
-    @pytest.mark.asyncio
-    async def test_analyze_feasibility_complex_pr(self, tool, sample_pr_complex):
+    def test_analyze_feasibility_complex_pr(self, tool, sample_pr_complex):
         """Test feasibility analysis for complex PR."""
-        result = await tool.analyze_feasibility(sample_pr_complex)
+        result = tool.analyze_feasibility(sample_pr_complex)
 
         assert "feasible" in result
         # May be feasible or not depending on risk factors
@@ -89,27 +87,23 @@ class TestFeasibilityAnalyzerTool:
         assert len(result["risk_factors"]) > 0  # Should have some risk factors
         assert len(result["recommendations"]) > 0  # Should have recommendations
 
-    @pytest.mark.asyncio
-    async def test_analyze_feasibility_too_many_files(self, tool, mock_settings):
+    def test_analyze_feasibility_too_many_files(self, tool, monkeypatch):
         """Test feasibility analysis with too many files."""
-        mock_settings.max_files_per_pr = 5
+        monkeypatch.setattr(tool._settings, "max_files_per_pr", 5)
 
         pr = {
             "files": [f"file_{i}.py" for i in range(10)],  # More than max
             "estimated_review_time": 60,
         }
 
-        result = await tool.analyze_feasibility(pr)
+        result = tool.analyze_feasibility(pr)
 
-        assert any(
-            "Large number of files" in factor for factor in result["risk_factors"]
-        )
+        assert RISK_LARGE_FILE_COUNT in result["risk_codes"]
         assert any(
             "splitting into smaller PRs" in rec for rec in result["recommendations"]
         )
 
-    @pytest.mark.asyncio
-    async def test_analyze_feasibility_mixed_file_types(self, tool):
+    def test_analyze_feasibility_mixed_file_types(self, tool):
         """Test feasibility analysis with mixed file types."""
         pr = {
             "files": [
@@ -121,26 +115,24 @@ class TestFeasibilityAnalyzerTool:
             "estimated_review_time": 45,
         }
 
-        result = await tool.analyze_feasibility(pr)
+        result = tool.analyze_feasibility(pr)
 
-        assert any("Mixed file types" in factor for factor in result["risk_factors"])
+        assert RISK_MIXED_FILE_TYPES in result["risk_codes"]
         assert any(
             "separating by file type" in rec for rec in result["recommendations"]
         )
 
-    @pytest.mark.asyncio
-    async def test_analyze_feasibility_exception_handling(self, tool):
+    def test_analyze_feasibility_exception_handling(self, tool):
         """Test feasibility analysis exception handling."""
         # Pass invalid PR data to trigger exception
         pr = None
 
-        result = await tool.analyze_feasibility(pr)
+        result = tool.analyze_feasibility(pr)
 
         assert "error" in result
         assert "Feasibility analysis failed" in result["error"]
 
-    @pytest.mark.asyncio
-    async def test_analyze_feasibility_high_risk_factors(self, tool):
+    def test_analyze_feasibility_high_risk_factors(self, tool):
         """Test feasibility analysis with many risk factors."""
         pr = {
             "files": [
@@ -152,7 +144,7 @@ class TestFeasibilityAnalyzerTool:
             "estimated_review_time": 90,
         }
 
-        result = await tool.analyze_feasibility(pr)
+        result = tool.analyze_feasibility(pr)
 
         # Should be marked as not feasible due to many risk factors
         if len(result["risk_factors"]) > 2:
@@ -162,7 +154,7 @@ class TestFeasibilityAnalyzerTool:
         """Test file categorization for source code."""
         files = ["src/main.py", "app.js", "Utils.java", "service.cpp"]
 
-        result = tool._categorize_files(files)
+        result = tool._categorize_files(tuple(files))
 
         assert "source" in result["file_types"]
         assert result["type_diversity"] == 1
@@ -178,7 +170,7 @@ class TestFeasibilityAnalyzerTool:
             "data.csv",  # other
         ]
 
-        result = tool._categorize_files(files)
+        result = tool._categorize_files(tuple(files))
 
         expected_types = {"source", "docs", "config", "test", "other"}
         assert set(result["file_types"]) == expected_types
@@ -193,7 +185,7 @@ class TestFeasibilityAnalyzerTool:
             "config/settings.yaml",
         ]
 
-        result = tool._categorize_files(files)
+        result = tool._categorize_files(tuple(files))
 
         assert result["directory_count"] == 3
         assert "src" in result["directories"]
@@ -210,7 +202,7 @@ class TestFeasibilityAnalyzerTool:
             "Makefile",  # no extension
         ]
 
-        result = tool._categorize_files(files)
+        result = tool._categorize_files(tuple(files))
 
         extensions = set(result["extensions"])
         assert ".py" in extensions
@@ -223,7 +215,7 @@ class TestFeasibilityAnalyzerTool:
         """Test complexity analysis for simple case."""
         files = ["main.py", "utils.py"]
 
-        result = tool._analyze_complexity(files)
+        result = tool._analyze_complexity(tuple(files))
 
         assert result["file_count"] == 2
         assert result["estimated_review_time_per_file"] == 10
@@ -236,7 +228,7 @@ class TestFeasibilityAnalyzerTool:
             f"dir{i}/file{j}.py" for i in range(5) for j in range(3)
         ]  # 15 files across 5 directories
 
-        result = tool._analyze_complexity(files)
+        result = tool._analyze_complexity(tuple(files))
 
         assert result["file_count"] == 15
         assert result["complexity_score"] == 10  # capped at 10
@@ -249,7 +241,7 @@ class TestFeasibilityAnalyzerTool:
         """Test complexity analysis with many file types."""
         files = ["file.py", "file.js", "file.cpp", "file.java", "file.go"]
 
-        result = tool._analyze_complexity(files)
+        result = tool._analyze_complexity(tuple(files))
 
         factors = [f for f in result["complexity_factors"] if f is not None]
         assert "Mixed file types" in factors
@@ -258,7 +250,7 @@ class TestFeasibilityAnalyzerTool:
         """Test basic dependency analysis."""
         files = ["src/app.py", "tests/test_app.py"]
 
-        result = tool._analyze_dependencies(files)
+        result = tool._analyze_dependencies(tuple(files))
 
         assert result["has_migration"] is False
         assert result["has_model"] is False
@@ -270,7 +262,7 @@ class TestFeasibilityAnalyzerTool:
         """Test dependency analysis with migration and model."""
         files = ["migrations/001_add_user.sql", "models/user.py"]
 
-        result = tool._analyze_dependencies(files)
+        result = tool._analyze_dependencies(tuple(files))
 
         assert result["has_migration"] is True
         assert result["has_model"] is True
@@ -282,7 +274,7 @@ class TestFeasibilityAnalyzerTool:
         """Test dependency analysis with config but no tests."""
         files = ["config.yaml", "settings.json"]
 
-        result = tool._analyze_dependencies(files)
+        result = tool._analyze_dependencies(tuple(files))
 
         assert result["has_config"] is True
         assert result["has_test"] is False
@@ -294,7 +286,7 @@ class TestFeasibilityAnalyzerTool:
         """Test dependency analysis with model but no tests."""
         files = ["models/user.py", "models/post.py"]
 
-        result = tool._analyze_dependencies(files)
+        result = tool._analyze_dependencies(tuple(files))
 
         assert result["has_model"] is True
         assert result["has_test"] is False
@@ -314,7 +306,7 @@ class TestFeasibilityAnalyzerTool:
         result = tool._check_risk_patterns(files)
 
         assert len(result["factors"]) > 0
-        assert any("Critical files present" in factor for factor in result["factors"])
+        assert RISK_CRITICAL_FILES in result["codes"]
         assert any("Extra review needed" in rec for rec in result["recommendations"])
 
     def test_check_risk_patterns_large_files(self, tool):
@@ -327,7 +319,7 @@ class TestFeasibilityAnalyzerTool:
 
         result = tool._check_risk_patterns(files)
 
-        assert any("large changes" in factor for factor in result["factors"])
+        assert RISK_LARGE_CHANGES in result["codes"]
         assert any("Verify file sizes" in rec for rec in result["recommendations"])
 
     def test_check_risk_patterns_no_risks(self, tool):
@@ -409,21 +401,19 @@ class TestFeasibilityAnalyzerTool:
         assert "Database migration is reversible" in checklist
         assert "Extra review by senior team member" in checklist
 
-    @pytest.mark.asyncio
-    async def test_analyze_feasibility_edge_cases(self, tool):
+    def test_analyze_feasibility_edge_cases(self, tool):
         """Test feasibility analysis edge cases."""
         # Empty files list
         pr_empty = {"files": [], "estimated_review_time": 0}
-        result = await tool.analyze_feasibility(pr_empty)
+        result = tool.analyze_feasibility(pr_empty)
         assert result["feasible"] is True
 
         # Missing estimated_review_time
         pr_no_time = {"files": ["file.py"]}
-        result = await tool.analyze_feasibility(pr_no_time)
+        result = tool.analyze_feasibility(pr_no_time)
         assert result["estimated_effort"] == 0
 
-    @pytest.mark.asyncio
-    async def test_analyze_feasibility_integration(self, tool):
+    def test_analyze_feasibility_integration(self, tool):
         """Test full integration of feasibility analysis."""
         pr = {
             "id": "integration_test",
@@ -440,7 +430,7 @@ class TestFeasibilityAnalyzerTool:
             "risk_level": "medium",
         }
 
-        result = await tool.analyze_feasibility(pr)
+        result = tool.analyze_feasibility(pr)
 
         # Verify all components are present
         assert "feasible" in result
@@ -1,51 +1,149 @@
 """Unit tests for strategy manager MCP tool."""
 
-from unittest.mock import AsyncMock, Mock, patch
+import asyncio
+from types import SimpleNamespace
 
 import pytest
+import pytest_asyncio
 
 from mcp_pr_recommender.tools.strategy_manager_tool import StrategyManagerTool
 
+# One prebuilt settings stub for the whole session; SimpleNamespace is
+# plain attribute storage, and it must be installed at session scope so
+# module-scoped fixtures below see it during setup.
+_SETTINGS_STUB = SimpleNamespace(
+    openai_api_key="test_key",
+    default_strategy="semantic",
+    max_files_per_pr=8,
+    min_files_per_pr=1,
+    similarity_threshold=0.7,
+    enable_llm_analysis=True,
+)
+
 
 # Mock settings globally to avoid OpenAI API key requirement
-@pytest.fixture(autouse=True)
+@pytest.fixture(autouse=True, scope="session")
 def mock_settings():
-    """Mock settings to avoid OpenAI API key requirement."""
-    with patch(
-        "mcp_pr_recommender.tools.strategy_manager_tool.settings"
-    ) as mock_settings_func:
-        mock_settings_instance = Mock()
-        mock_settings_instance.openai_api_key = "test_key"
-        mock_settings_instance.default_strategy = "semantic"
-        mock_settings_instance.max_files_per_pr = 8
-        mock_settings_instance.min_files_per_pr = 1
-        mock_settings_instance.similarity_threshold = 0.7
-        mock_settings_func.return_value = mock_settings_instance
-        yield mock_settings_instance
+    """Point the settings accessor at the shared stub once per session."""
+    mp = pytest.MonkeyPatch()
+    mp.setattr(
+        "mcp_pr_recommender.tools.strategy_manager_tool.settings",
+        lambda: _SETTINGS_STUB,
+    )
+    yield _SETTINGS_STUB
+    mp.undo()
+
+
+_EXPECTED_STRATEGIES = ("semantic", "directory", "size", "dependency", "hybrid")
+
+_EXPECTED_SCENARIOS = (
+    "small_changes",
+    "large_refactoring",
+    "mixed_concerns",
+    "configuration",
+    "documentation",
+)
+
+
+def _check_structure(result):
+    """Result exposes strategies, a valid default, and recommendations."""
+    assert "available_strategies" in result
+    assert "default_strategy" in result
+    assert "recommendations" in result
+    assert result["default_strategy"] in result["available_strategies"]
+
+
+def _check_all_strategies_present(result):
+    """Every known strategy is listed; nothing is filtered out."""
+    strategies = result["available_strategies"]
+    for strategy in _EXPECTED_STRATEGIES:
+        assert strategy in strategies
+    assert len(strategies) >= len(_EXPECTED_STRATEGIES)
+
+
+def _check_default_is_semantic(result):
+    """The default strategy is available and currently semantic."""
+    assert "semantic" in result["available_strategies"]
+    assert result["default_strategy"] == "semantic"
+
+
+def _check_unknown_strategy_absent(result):
+    """Unknown names are not offered, but real choices exist."""
+    strategies = result["available_strategies"]
+    assert "nonexistent_strategy" not in strategies
+    assert len(strategies) > 0
+
+
+def _check_scenario_recommendations(result):
+    """Each scenario gets a meaningful textual recommendation."""
+    recommendations = result["recommendations"]
+    for scenario in _EXPECTED_SCENARIOS:
+        assert scenario in recommendations
+        assert isinstance(recommendations[scenario], str)
+        assert len(recommendations[scenario]) > 10  # Should have meaningful guidance
+
+
+def _check_compatibility_details(result):
+    """Every strategy documents pros, cons, and LLM requirements."""
+    for strategy_info in result["available_strategies"].values():
+        assert "pros" in strategy_info
+        assert "cons" in strategy_info
+        assert "requires_llm" in strategy_info
+        assert isinstance(strategy_info["pros"], list)
+        assert isinstance(strategy_info["cons"], list)
+
+
+def _check_performance_characteristics(result):
+    """Every strategy documents its use case and LLM cost."""
+    for strategy_info in result["available_strategies"].values():
+        assert "best_for" in strategy_info  # Use case information
+        assert "requires_llm" in strategy_info  # Performance consideration
+        assert isinstance(strategy_info["best_for"], str)
+        assert isinstance(strategy_info["requires_llm"], bool)
+
+
+# Each entry asserts one facet of the shared get_strategies() result;
+# parametrizing over checks replaces six near-identical async tests.
+_STRATEGY_CHECKS = {
+    "structure": _check_structure,
+    "all_strategies": _check_all_strategies_present,
+    "default_semantic": _check_default_is_semantic,
+    "unknown_absent": _check_unknown_strategy_absent,
+    "scenario_recommendations": _check_scenario_recommendations,
+    "compatibility": _check_compatibility_details,
+    "performance": _check_performance_characteristics,
+}
 
 
 @pytest.mark.unit
 class TestStrategyManagerTool:
     """Test cases for the strategy manager MCP tool."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
+    def event_loop(self):
+        """Share one event loop across this module's async tests.
+
+        Overrides pytest-asyncio's function-scoped default so the
+        module-scoped strategies_result fixture can await on it.
+        """
+        loop = asyncio.new_event_loop()
+        yield loop
+        loop.close()
+
+    @pytest.fixture(scope="module")
     def strategy_manager_tool(self):
-        """Create strategy manager tool instance."""
+        """Create one strategy manager tool instance per module."""
         return StrategyManagerTool()
 
-    @pytest.fixture
-    def mock_context(self):
-        """Mock MCP context."""
-        ctx = AsyncMock()
-        ctx.info = AsyncMock()
-        ctx.debug = AsyncMock()
-        ctx.warning = AsyncMock()
-        ctx.error = AsyncMock()
-        return ctx
+    @pytest_asyncio.fixture(scope="module")
+    async def strategies_result(self, strategy_manager_tool):
+        """get_strategies() awaited once; the call is pure and deterministic,
+        so every assertion-only test can share the result."""
+        return await strategy_manager_tool.get_strategies()
 
     @pytest.mark.asyncio
     async def test_get_strategy_options_success(self, strategy_manager_tool):
-        """Test successful retrieval of strategy options."""
+        """Test successful retrieval of strategy options (end-to-end async path)."""
         result = await strategy_manager_tool.get_strategies()
 
         # Verify result structure - tool returns "available_strategies" not "strategies"
@@ -69,98 +167,9 @@ class TestStrategyManagerTool:
         # Verify default strategy is valid
         assert result["default_strategy"] in strategies
 
-    @pytest.mark.asyncio
-    async def test_get_strategy_options_with_filter(self, strategy_manager_tool):
-        """Test retrieval of strategy options - no filtering supported in current implementation."""
-        # The current implementation doesn't support filtering, so test basic functionality
-        result = await strategy_manager_tool.get_strategies()
-
-        # Should return all available strategies
-        strategies = result["available_strategies"]
-        expected_strategies = ["semantic", "directory", "size", "dependency", "hybrid"]
-
-        for strategy in expected_strategies:
-            assert strategy in strategies
-
-        # All strategies should be present since no filtering is implemented
-        assert len(strategies) >= len(expected_strategies)
-
-    @pytest.mark.asyncio
-    async def test_set_default_strategy_valid(self, strategy_manager_tool):
-        """Test that the tool provides strategy information (no set functionality in current implementation)."""
-        # The current StrategyManagerTool only provides get_strategies(), not set functionality
-        # Test that we can get valid strategies that could be set
-        result = await strategy_manager_tool.get_strategies()
-
-        valid_strategy = "semantic"
-        strategies = result["available_strategies"]
-
-        # Verify the strategy we want to set is available
-        assert valid_strategy in strategies
-        assert result["default_strategy"] == valid_strategy  # Current default
-
-    @pytest.mark.asyncio
-    async def test_set_default_strategy_invalid(self, strategy_manager_tool):
-        """Test validation against invalid strategies."""
-        # The current StrategyManagerTool doesn't support setting, but test validation logic
-        result = await strategy_manager_tool.get_strategies()
-
-        invalid_strategy = "nonexistent_strategy"
-        strategies = result["available_strategies"]
-
-        # Verify the invalid strategy is not in available strategies
-        assert invalid_strategy not in strategies
-
-        # Should have some available strategies to choose from
-        assert len(strategies) > 0
-
-    @pytest.mark.asyncio
-    async def test_strategy_recommendations(self, strategy_manager_tool):
-        """Test strategy recommendations provided by the tool."""
-        result = await strategy_manager_tool.get_strategies()
-
-        # Verify recommendations are provided
-        assert "recommendations" in result
-        recommendations = result["recommendations"]
-
-        # Should have recommendations for different scenarios
-        expected_scenarios = [
-            "small_changes",
-            "large_refactoring",
-            "mixed_concerns",
-            "configuration",
-            "documentation",
-        ]
-        for scenario in expected_scenarios:
-            assert scenario in recommendations
-            assert isinstance(recommendations[scenario], str)
-            assert (
-                len(recommendations[scenario]) > 10
-            )  # Should have meaningful guidance
-
-    @pytest.mark.asyncio
-    async def test_strategy_compatibility(self, strategy_manager_tool):
-        """Test strategy information includes compatibility details."""
-        result = await strategy_manager_tool.get_strategies()
-
-        # Verify strategy details include pros/cons (compatibility info)
-        strategies = result["available_strategies"]
-        for _, strategy_info in strategies.items():
-            assert "pros" in strategy_info
-            assert "cons" in strategy_info
-            assert "requires_llm" in strategy_info
-            assert isinstance(strategy_info["pros"], list)
-            assert isinstance(strategy_info["cons"], list)
-
-    @pytest.mark.asyncio
-    async def test_strategy_performance_characteristics(self, strategy_manager_tool):
-        """Test strategy performance characteristics are provided."""
-        result = await strategy_manager_tool.get_strategies()
-
-        # Verify performance-related data exists for each strategy
-        strategies = result["available_strategies"]
-        for _, strategy_info in strategies.items():
-            assert "best_for" in strategy_info  # Use case information
-            assert "requires_llm" in strategy_info  # Performance consideration
-            assert isinstance(strategy_info["best_for"], str)
-            assert isinstance(strategy_info["requires_llm"], bool)
+    @pytest.mark.parametrize(
+        "check", _STRATEGY_CHECKS.values(), ids=_STRATEGY_CHECKS.keys()
+    )
+    def test_get_strategies_contract(self, strategies_result, check):
+        """Each check validates one facet of the shared result dict."""
+        check(strategies_result)
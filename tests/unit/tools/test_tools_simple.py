@@ -1,238 +1,214 @@
 """Simple unit tests for PR recommender tools."""
 
-from unittest.mock import Mock, patch
+from types import SimpleNamespace
 
 import pytest
 
-from mcp_pr_recommender.tools.pr_recommender_tool import PRRecommenderTool
-from mcp_pr_recommender.tools.strategy_manager_tool import StrategyManagerTool
-from mcp_pr_recommender.tools.validator_tool import ValidatorTool
-
-
-# Mock settings for all tests
-@pytest.fixture(autouse=True)
-def mock_settings():
-    """Mock settings to avoid OpenAI API key requirement."""
-    with patch("mcp_pr_recommender.config.settings") as mock_settings_func:
-        mock_settings_instance = Mock()
-        mock_settings_instance.openai_api_key = "test_key"
-        mock_settings_instance.default_strategy = "semantic"
-        mock_settings_instance.max_files_per_pr = 8
-        mock_settings_instance.min_files_per_pr = 1
-        mock_settings_instance.similarity_threshold = 0.7
-        mock_settings_instance.enable_llm_analysis = True
-        mock_settings_func.return_value = mock_settings_instance
-        yield mock_settings_instance
-
-
-@pytest.mark.unit
-class TestPRRecommenderToolSimple:
-    """Simple test cases for the PR recommender tool."""
-
-    def test_tool_initialization(self):
-        """Test tool can be initialized."""
-        with patch("openai.AsyncOpenAI"), patch(
-            "mcp_pr_recommender.services.semantic_analyzer.settings"
-        ) as mock_sa_settings:
-            mock_sa_settings.return_value.openai_api_key = "test_key"
-            tool = PRRecommenderTool()
-            assert tool is not None
-            assert hasattr(tool, "semantic_analyzer")
-
-    @pytest.mark.asyncio
-    async def test_generate_recommendations_empty_data(self):
-        """Test handling of empty analysis data."""
-        with patch("openai.AsyncOpenAI"), patch(
-            "mcp_pr_recommender.services.semantic_analyzer.settings"
-        ) as mock_sa_settings:
-            mock_sa_settings.return_value.openai_api_key = "test_key"
-            tool = PRRecommenderTool()
-
-            # Mock the semantic analyzer
-            with patch.object(tool, "semantic_analyzer") as mock_analyzer:
-                mock_analyzer.generate_pr_recommendations.return_value = {
-                    "recommendations": [],
-                    "metadata": {"reason": "No changes detected"},
-                }
-
-                result = await tool.generate_recommendations({})
-
-                assert "recommendations" in result
-                # Tool returns different structure - check for key fields
-                assert "strategy_used" in result or "error" in result
-
-
-@pytest.mark.unit
-class TestStrategyManagerToolSimple:
-    """Simple test cases for the strategy manager tool."""
-
-    def test_tool_initialization(self):
-        """Test tool can be initialized."""
-        tool = StrategyManagerTool()
-        assert tool is not None
-        assert hasattr(tool, "logger")
-
-    @pytest.mark.asyncio
-    async def test_get_strategies(self, mock_settings):
-        """Test getting available strategies."""
-        tool = StrategyManagerTool()
-
-        with patch(
-            "mcp_pr_recommender.tools.strategy_manager_tool.settings"
-        ) as mock_runtime_settings:
-            mock_runtime_settings.return_value.openai_api_key = "test_key"
-            mock_runtime_settings.return_value.default_strategy = "semantic"
-            mock_runtime_settings.return_value.max_files_per_pr = 8
-            mock_runtime_settings.return_value.similarity_threshold = 0.7
-
-            result = await tool.get_strategies()
-
-        assert "available_strategies" in result
-        assert "default_strategy" in result
-        assert "current_settings" in result
-        assert "recommendations" in result
-
-        # Verify expected strategies are present
-        strategies = result["available_strategies"]
-        expected_strategies = ["semantic", "directory", "size", "dependency", "hybrid"]
-        for strategy in expected_strategies:
-            assert strategy in strategies
-
-
-@pytest.mark.unit
-class TestValidatorToolSimple:
-    """Simple test cases for the validator tool."""
-
-    def test_tool_initialization(self):
-        """Test tool can be initialized."""
-        tool = ValidatorTool()
-        assert tool is not None
-        assert hasattr(tool, "logger")
-
-    @pytest.mark.asyncio
-    async def test_validate_empty_recommendations(self):
-        """Test validation of empty recommendations."""
-        tool = ValidatorTool()
-
-        result = await tool.validate_recommendations([])
-
-        assert "overall_valid" in result
-        assert "recommendations_analysis" in result
-        assert "coverage_analysis" in result
-        assert "conflict_analysis" in result
-        assert "suggestions" in result
-        assert "quality_score" in result
-
-        assert result["overall_valid"] is True  # Empty is valid
-        assert len(result["recommendations_analysis"]) == 0
-        assert result["quality_score"] == 0.0
-
-    @pytest.mark.asyncio
-    async def test_validate_single_valid_recommendation(self):
-        """Test validation of single valid recommendation."""
-        tool = ValidatorTool()
-
-        valid_rec = [
-            {
-                "id": "pr_001",
-                "title": "Add authentication system",
-                "description": "Implement user authentication with login and logout",
-                "files": [
-                    "src/auth/login.py",
-                    "src/auth/logout.py",
-                    "tests/test_auth.py",
-                ],
-                "estimated_size": "medium",
-                "priority": "high",
-                "risk_level": "medium",
-                "confidence": 0.9,
-                "labels": ["feature", "authentication"],
-            }
+pytestmark = pytest.mark.unit
+
+# One prebuilt settings stub for the whole module; SimpleNamespace is
+# just attribute storage, with none of Mock's child-mock machinery.
+_SETTINGS_STUB = SimpleNamespace(
+    openai_api_key="test_key",
+    default_strategy="semantic",
+    max_files_per_pr=8,
+    min_files_per_pr=1,
+    similarity_threshold=0.7,
+    enable_llm_analysis=True,
+)
+
+
+# The tool classes are imported lazily inside module-scoped fixtures so
+# collecting or running a subset of this file does not pay the transitive
+# import cost (PRRecommenderTool pulls in the OpenAI client stack).
+@pytest.fixture(scope="module")
+def pr_recommender_cls():
+    """Import and return the PR recommender tool class."""
+    from mcp_pr_recommender.tools.pr_recommender_tool import PRRecommenderTool
+
+    return PRRecommenderTool
+
+
+@pytest.fixture(scope="module")
+def strategy_manager_cls():
+    """Import and return the strategy manager tool class."""
+    from mcp_pr_recommender.tools.strategy_manager_tool import StrategyManagerTool
+
+    return StrategyManagerTool
+
+
+@pytest.fixture(scope="module")
+def validator_cls():
+    """Import and return the validator tool class."""
+    from mcp_pr_recommender.tools.validator_tool import ValidatorTool
+
+    return ValidatorTool
+
+
+def test_pr_recommender_initialization(pr_recommender_cls):
+    """Test tool can be initialized."""
+    tool = pr_recommender_cls()
+    assert tool is not None
+    assert hasattr(tool, "semantic_analyzer")
+
+
+@pytest.mark.asyncio
+async def test_generate_recommendations_empty_data(pr_recommender_cls):
+    """Test handling of empty analysis data."""
+    tool = pr_recommender_cls()
+
+    # Stub the semantic analyzer; tool is test-local, so direct
+    # assignment beats patch.object and a MagicMock attribute tree
+    async def _gen(_data):
+        return {
+            "recommendations": [],
+            "metadata": {"reason": "No changes detected"},
+        }
+
+    tool.semantic_analyzer = SimpleNamespace(generate_pr_recommendations=_gen)
+
+    result = await tool.generate_recommendations({})
+
+    assert "recommendations" in result
+    # Tool returns different structure - check for key fields
+    assert "strategy_used" in result or "error" in result
+
+
+def test_strategy_manager_initialization(strategy_manager_cls):
+    """Test tool can be initialized."""
+    tool = strategy_manager_cls()
+    assert tool is not None
+    assert hasattr(tool, "logger")
+
+
+@pytest.mark.asyncio
+async def test_get_strategies(strategy_manager_cls, monkeypatch):
+    """Test getting available strategies."""
+    tool = strategy_manager_cls()
+
+    monkeypatch.setattr(
+        "mcp_pr_recommender.tools.strategy_manager_tool.settings",
+        lambda: _SETTINGS_STUB,
+    )
+    result = await tool.get_strategies()
+
+    assert "available_strategies" in result
+    assert "default_strategy" in result
+    assert "current_settings" in result
+    assert "recommendations" in result
+
+    # Verify expected strategies are present
+    strategies = result["available_strategies"]
+    expected_strategies = ["semantic", "directory", "size", "dependency", "hybrid"]
+    for strategy in expected_strategies:
+        assert strategy in strategies
+
+
+def test_validator_initialization(validator_cls):
+    """Test tool can be initialized."""
+    tool = validator_cls()
+    assert tool is not None
+    assert hasattr(tool, "logger")
+
+
+@pytest.mark.asyncio
+async def test_validate_empty_recommendations(validator_cls, validator_result_shape):
+    """Test validation of empty recommendations."""
+    tool = validator_cls()
+
+    result = await tool.validate_recommendations([])
+
+    validator_result_shape(result)
+    assert result["overall_valid"] is True  # Empty is valid
+    assert len(result["recommendations_analysis"]) == 0
+    assert result["quality_score"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_validate_single_valid_recommendation(validator_cls, monkeypatch):
+    """Test validation of single valid recommendation."""
+    tool = validator_cls()
+
+    valid_rec = [
+        {
+            "id": "pr_001",
+            "title": "Add authentication system",
+            "description": "Implement user authentication with login and logout",
+            "files": [
+                "src/auth/login.py",
+                "src/auth/logout.py",
+                "tests/test_auth.py",
+            ],
+            "estimated_size": "medium",
+            "priority": "high",
+            "risk_level": "medium",
+            "confidence": 0.9,
+            "labels": ["feature", "authentication"],
+        }
+    ]
+
+    monkeypatch.setattr(
+        "mcp_pr_recommender.tools.validator_tool.settings",
+        lambda: _SETTINGS_STUB,
+    )
+    result = await tool.validate_recommendations(valid_rec)
+
+    assert len(result["recommendations_analysis"]) == 1
+    # Note: The actual validation logic may mark this as invalid due to
+    # missing fields or other validation rules, so we just check structure
+    assert "valid" in result["recommendations_analysis"][0]
+    # Tool returns "issues" not "errors"
+    assert "issues" in result["recommendations_analysis"][0]
+
+
+@pytest.mark.asyncio
+async def test_workflow_simulation(
+    pr_recommender_cls, validator_cls, validator_result_shape, monkeypatch
+):
+    """Recommender output feeds the validator unchanged.
+
+    Each tool's own behavior has dedicated tests; this covers only the
+    cross-tool handoff none of them exercise.
+    """
+    from mcp_shared_lib.models.git.files import FileStatus
+
+    from mcp_pr_recommender.models.pr.recommendations import PRRecommendation
+
+    pr_tool = pr_recommender_cls()
+    validator_tool = validator_cls()
+    monkeypatch.setattr(
+        "mcp_pr_recommender.tools.validator_tool.settings",
+        lambda: _SETTINGS_STUB,
+    )
+
+    changed_files = [
+        FileStatus(path="src/test.py", status_code="M", lines_added=10, lines_deleted=2)
+    ]
+    pr_tool._extract_all_files = lambda *a, **k: changed_files
+
+    async def _analyze(*args, **kwargs):
+        return [
+            PRRecommendation.model_construct(
+                id="pr_001",
+                title="Test PR",
+                description="Test changes",
+                files=["src/test.py"],
+                branch_name="feature/test-changes",
+                priority="medium",
+                estimated_review_time=15,
+                risk_level="low",
+                reasoning="Single file change",
+                files_count=1,
+                total_lines_changed=12,
+            )
         ]
 
-        with patch(
-            "mcp_pr_recommender.tools.validator_tool.settings"
-        ) as mock_runtime_settings:
-            mock_runtime_settings.return_value.openai_api_key = "test_key"
-            mock_runtime_settings.return_value.max_files_per_pr = 8
-            mock_runtime_settings.return_value.min_files_per_pr = 1
-
-            result = await tool.validate_recommendations(valid_rec)
-
-        assert len(result["recommendations_analysis"]) == 1
-        # Note: The actual validation logic may mark this as invalid due to
-        # missing fields or other validation rules, so we just check structure
-        assert "valid" in result["recommendations_analysis"][0]
-        # Tool returns "issues" not "errors"
-        assert "issues" in result["recommendations_analysis"][0]
-
-
-@pytest.mark.unit
-class TestToolIntegration:
-    """Test basic integration between tools."""
-
-    def test_all_tools_can_be_imported(self):
-        """Test that all tool classes can be imported and initialized."""
-        with patch("openai.AsyncOpenAI"), patch(
-            "mcp_pr_recommender.services.semantic_analyzer.settings"
-        ) as mock_sa_settings:
-            mock_sa_settings.return_value.openai_api_key = "test_key"
-            pr_tool = PRRecommenderTool()
-            strategy_tool = StrategyManagerTool()
-            validator_tool = ValidatorTool()
-
-            assert pr_tool is not None
-            assert strategy_tool is not None
-            assert validator_tool is not None
-
-    @pytest.mark.asyncio
-    async def test_workflow_simulation(self, mock_settings):
-        """Test a basic workflow simulation."""
-        with patch("openai.AsyncOpenAI"), patch(
-            "mcp_pr_recommender.services.semantic_analyzer.settings"
-        ) as mock_sa_settings:
-            mock_sa_settings.return_value.openai_api_key = "test_key"
-            # Initialize tools
-            strategy_tool = StrategyManagerTool()
-            pr_tool = PRRecommenderTool()
-            validator_tool = ValidatorTool()
-
-            # Get strategies - need runtime settings mocking
-            with patch(
-                "mcp_pr_recommender.tools.strategy_manager_tool.settings"
-            ) as mock_runtime_settings:
-                mock_runtime_settings.return_value.openai_api_key = "test_key"
-                mock_runtime_settings.return_value.default_strategy = "semantic"
-                mock_runtime_settings.return_value.max_files_per_pr = 8
-                mock_runtime_settings.return_value.similarity_threshold = 0.7
-
-                strategies_result = await strategy_tool.get_strategies()
-                assert "available_strategies" in strategies_result
-
-            # Generate recommendations (mocked)
-            with patch.object(pr_tool, "semantic_analyzer") as mock_analyzer:
-                mock_analyzer.generate_pr_recommendations.return_value = {
-                    "recommendations": [
-                        {
-                            "id": "pr_001",
-                            "title": "Test PR",
-                            "description": "Test changes",
-                            "files": ["src/test.py"],
-                            "estimated_size": "small",
-                            "priority": "medium",
-                            "risk_level": "low",
-                            "confidence": 0.8,
-                        }
-                    ],
-                    "metadata": {"strategy": "semantic"},
-                }
-
-                pr_result = await pr_tool.generate_recommendations({})
-                assert "recommendations" in pr_result
-
-                # Validate recommendations
-                recommendations = pr_result["recommendations"]
-                validation_result = await validator_tool.validate_recommendations(
-                    recommendations
-                )
-                assert "overall_valid" in validation_result
+    pr_tool.semantic_analyzer = SimpleNamespace(analyze_and_generate_prs=_analyze)
+
+    pr_result = await pr_tool.generate_recommendations({})
+    assert pr_result["recommendations"]
+
+    validation_result = await validator_tool.validate_recommendations(
+        pr_result["recommendations"]
+    )
+    validator_result_shape(validation_result)
@@ -1,105 +1,168 @@
 """Unit tests for validator MCP tool."""
 
-from unittest.mock import Mock, patch
+from types import MappingProxyType, SimpleNamespace
 
 import pytest
+import pytest_asyncio
 
 from mcp_pr_recommender.tools.validator_tool import ValidatorTool
 
-
-# Mock settings globally to avoid OpenAI API key requirement
-@pytest.fixture(autouse=True)
+# One prebuilt settings stub for the whole module; SimpleNamespace is
+# just attribute storage, with none of Mock's child-mock machinery.
+_SETTINGS_STUB = SimpleNamespace(
+    openai_api_key="test_key",
+    max_files_per_pr=8,
+    min_files_per_pr=1,
+    similarity_threshold=0.7,
+)
+
+
+# Mock settings to avoid the OpenAI API key requirement; session scope
+# so module-scoped fixtures see the stub during setup. Only tests that
+# actually drive the validator over recommendations request it - the
+# accessor is consulted per analyzed recommendation.
+@pytest.fixture(scope="session")
 def mock_settings():
-    """Mock settings to avoid OpenAI API key requirement."""
-    with patch(
-        "mcp_pr_recommender.tools.validator_tool.settings"
-    ) as mock_settings_func:
-        mock_settings_instance = Mock()
-        mock_settings_instance.openai_api_key = "test_key"
-        mock_settings_instance.max_files_per_pr = 8
-        mock_settings_instance.min_files_per_pr = 1
-        mock_settings_instance.similarity_threshold = 0.7
-        mock_settings_func.return_value = mock_settings_instance
-        yield mock_settings_instance
+    """Point the settings accessor at the shared stub once per session."""
+    mp = pytest.MonkeyPatch()
+    mp.setattr(
+        "mcp_pr_recommender.tools.validator_tool.settings", lambda: _SETTINGS_STUB
+    )
+    yield _SETTINGS_STUB
+    mp.undo()
+
+
+# The tool keeps no per-test mutable state and the sample payloads are
+# never mutated, so one instance of each per module is enough.
+@pytest.fixture(scope="module")
+def validator_tool():
+    """Create validator tool instance."""
+    return ValidatorTool()
+
+
+# Sample payloads, built once at import and wrapped in MappingProxyType:
+# the validator only reads them, and freezing makes the sharing safe.
+_VALID_RECS = tuple(
+    MappingProxyType(rec)
+    for rec in [
+        {
+            "id": "pr_001",
+            "title": "Add user authentication system",
+            "description": "Implement comprehensive user authentication with login, logout, and session management.",
+            "files": [
+                "src/auth/login.py",
+                "src/auth/logout.py",
+                "tests/test_auth.py",
+            ],
+            "estimated_size": "medium",
+            "priority": "high",
+            "risk_level": "medium",
+            "confidence": 0.92,
+            "labels": ["feature", "authentication"],
+            "reviewers": ["senior-dev", "security-team"],
+            "branch_name": "feature/auth-system",
+        },
+        {
+            "id": "pr_002",
+            "title": "Update user model",
+            "description": "Enhance user model with new fields.",
+            "files": ["src/models/user.py", "tests/test_user_model.py"],
+            "estimated_size": "small",
+            "priority": "medium",
+            "risk_level": "low",
+            "confidence": 0.88,
+            "labels": ["enhancement", "models"],
+            "reviewers": ["backend-team"],
+            "branch_name": "feature/user-model-updates",
+        },
+    ]
+)
+
+_INVALID_RECS = tuple(
+    MappingProxyType(rec)
+    for rec in [
+        {
+            "id": "pr_003",
+            # Missing title
+            "description": "Some changes",
+            "files": [],  # No files
+            "estimated_size": "invalid_size",  # Invalid size
+            "priority": "invalid_priority",  # Invalid priority
+            "risk_level": "medium",
+            "confidence": 1.5,  # Invalid confidence > 1.0
+        },
+        {
+            "id": "pr_004",
+            "title": "",  # Empty title
+            "description": "",  # Empty description
+            "files": ["src/auth/login.py"],  # File overlap with pr_001
+            "estimated_size": "large",
+            "priority": "low",
+            "risk_level": "critical",
+            "confidence": -0.1,  # Invalid negative confidence
+        },
+    ]
+)
+
+
+# Base recommendation for the lenient-validation cases; each case
+# overrides one field with a value the validator may or may not flag.
+_LENIENT_BASE = MappingProxyType(
+    {
+        "id": "pr_001",
+        "title": "Test PR",
+        "description": "Test changes",
+        "files": ["src/test.py"],
+        "estimated_size": "small",
+        "priority": "medium",
+        "risk_level": "low",
+        "confidence": 0.9,
+        "branch_name": "test/lenient-validation",
+    }
+)
+
+# Fifty paths is well past max_files_per_pr; built once, reused read-only.
+_FIFTY_FILES = tuple(f"src/file_{i}.py" for i in range(50))
+
+_LENIENT_CASES = {
+    "size_vs_file_count": ("files", list(_FIFTY_FILES)),
+    "confidence_above_one": ("confidence", 1.5),
+    "confidence_negative": ("confidence", -0.1),
+    "invalid_size": ("estimated_size", "invalid_size"),
+    "invalid_priority": ("priority", "invalid_priority"),
+    "invalid_risk": ("risk_level", "invalid_risk"),
+}
+
+
+@pytest.fixture(scope="module")
+def valid_recommendations():
+    """Sample valid PR recommendations."""
+    return _VALID_RECS
+
+
+@pytest.fixture(scope="module")
+def invalid_recommendations():
+    """Sample invalid PR recommendations."""
+    return _INVALID_RECS
+
+
+@pytest_asyncio.fixture(scope="module")
+async def valid_result(validator_tool, valid_recommendations, mock_settings):
+    """validate_recommendations() awaited once on the valid sample.
+
+    The call is deterministic, so every assertion-only consumer can
+    share the result instead of re-running the validator.
+    """
+    return await validator_tool.validate_recommendations(valid_recommendations)
 
 
 @pytest.mark.unit
 class TestValidatorTool:
     """Test cases for the validator MCP tool."""
 
-    @pytest.fixture
-    def validator_tool(self):
-        """Create validator tool instance."""
-        return ValidatorTool()
-
-    @pytest.fixture
-    def valid_recommendations(self):
-        """Sample valid PR recommendations."""
-        return [
-            {
-                "id": "pr_001",
-                "title": "Add user authentication system",
-                "description": "Implement comprehensive user authentication with login, logout, and session management.",
-                "files": [
-                    "src/auth/login.py",
-                    "src/auth/logout.py",
-                    "tests/test_auth.py",
-                ],
-                "estimated_size": "medium",
-                "priority": "high",
-                "risk_level": "medium",
-                "confidence": 0.92,
-                "labels": ["feature", "authentication"],
-                "reviewers": ["senior-dev", "security-team"],
-                "branch_name": "feature/auth-system",
-            },
-            {
-                "id": "pr_002",
-                "title": "Update user model",
-                "description": "Enhance user model with new fields.",
-                "files": ["src/models/user.py", "tests/test_user_model.py"],
-                "estimated_size": "small",
-                "priority": "medium",
-                "risk_level": "low",
-                "confidence": 0.88,
-                "labels": ["enhancement", "models"],
-                "reviewers": ["backend-team"],
-                "branch_name": "feature/user-model-updates",
-            },
-        ]
-
-    @pytest.fixture
-    def invalid_recommendations(self):
-        """Sample invalid PR recommendations."""
-        return [
-            {
-                "id": "pr_003",
-                # Missing title
-                "description": "Some changes",
-                "files": [],  # No files
-                "estimated_size": "invalid_size",  # Invalid size
-                "priority": "invalid_priority",  # Invalid priority
-                "risk_level": "medium",
-                "confidence": 1.5,  # Invalid confidence > 1.0
-            },
-            {
-                "id": "pr_004",
-                "title": "",  # Empty title
-                "description": "",  # Empty description
-                "files": ["src/auth/login.py"],  # File overlap with pr_001
-                "estimated_size": "large",
-                "priority": "low",
-                "risk_level": "critical",
-                "confidence": -0.1,  # Invalid negative confidence
-            },
-        ]
-
-    @pytest.mark.asyncio
-    async def test_validate_recommendations_valid(
-        self, validator_tool, valid_recommendations
-    ):
+    def test_validate_recommendations_valid(self, valid_result):
         """Test validation of valid PR recommendations."""
-        result = await validator_tool.validate_recommendations(valid_recommendations)
+        result = valid_result
 
         assert result["overall_valid"] is True
         assert len(result["recommendations_analysis"]) == 2
@@ -117,7 +180,7 @@ class TestValidatorTool:
 
     @pytest.mark.asyncio
     async def test_validate_recommendations_invalid(
-        self, validator_tool, invalid_recommendations
+        self, validator_tool, invalid_recommendations, mock_settings
     ):
         """Test validation of invalid PR recommendations."""
         result = await validator_tool.validate_recommendations(invalid_recommendations)
@@ -138,10 +201,13 @@ class TestValidatorTool:
         assert len(result["suggestions"]) > 0  # Should have suggestions for improvement
 
     @pytest.mark.asyncio
-    async def test_validate_recommendations_empty(self, validator_tool):
+    async def test_validate_recommendations_empty(
+        self, validator_tool, validator_result_shape
+    ):
         """Test validation of empty recommendations list."""
         result = await validator_tool.validate_recommendations([])
 
+        validator_result_shape(result)
         assert result["overall_valid"] is True  # Empty is technically valid
         assert len(result["recommendations_analysis"]) == 0
         assert result["quality_score"] == 0.0
@@ -149,7 +215,9 @@ class TestValidatorTool:
         assert isinstance(result["suggestions"], list)
 
     @pytest.mark.asyncio
-    async def test_validate_file_overlap_detection(self, validator_tool):
+    async def test_validate_file_overlap_detection(
+        self, validator_tool, validator_result_shape, mock_settings
+    ):
         """Test detection of file overlaps between PRs."""
         overlapping_recs = [
             {
@@ -181,6 +249,9 @@ class TestValidatorTool:
 
         result = await validator_tool.validate_recommendations(overlapping_recs)
 
+        # Overall structure should be present
+        validator_result_shape(result)
+
         # The validator may not mark overlapping files as invalid overall
         # but should detect conflicts in analysis
         conflict_analysis = result["conflict_analysis"]
@@ -193,72 +264,30 @@ class TestValidatorTool:
             # Check for overlap detection
             assert isinstance(conflict_analysis["file_overlaps"], list | dict)
 
-        # Overall structure should be present
-        assert "conflict_analysis" in result
-
     @pytest.mark.asyncio
-    async def test_validate_size_consistency(self, validator_tool):
-        """Test validation of PR size consistency."""
-        size_inconsistent_recs = [
-            {
-                "id": "pr_001",
-                "title": "Massive changes",
-                "description": "Huge refactor",
-                "files": [f"src/file_{i}.py" for i in range(50)],  # 50 files = large
-                "estimated_size": "small",  # Inconsistent with file count
-                "priority": "high",
-                "risk_level": "medium",
-                "confidence": 0.9,
-                "branch_name": "refactor/massive-changes",
-            }
-        ]
+    @pytest.mark.parametrize(
+        "bad_field,bad_value", _LENIENT_CASES.values(), ids=_LENIENT_CASES.keys()
+    )
+    async def test_lenient_field_validation(
+        self, validator_tool, mock_settings, bad_field, bad_value
+    ):
+        """Questionable field values are analyzed without crashing.
 
-        result = await validator_tool.validate_recommendations(size_inconsistent_recs)
+        The validator is deliberately lenient about size consistency,
+        confidence bounds and enum values, so these cases only assert
+        that analysis ran and produced the expected shape.
+        """
+        rec = {**_LENIENT_BASE, bad_field: bad_value}
+
+        result = await validator_tool.validate_recommendations([rec])
 
         analysis = result["recommendations_analysis"][0]
-        # May be valid despite file count if other factors are good
-        # Just check that validation was performed
         assert "valid" in analysis
         assert "issues" in analysis
+        assert isinstance(analysis["valid"], bool)
 
     @pytest.mark.asyncio
-    async def test_validate_confidence_bounds(self, validator_tool):
-        """Test validation of confidence score bounds."""
-        confidence_invalid_recs = [
-            {
-                "id": "pr_001",
-                "title": "Valid PR",
-                "description": "Good changes",
-                "files": ["src/test.py"],
-                "estimated_size": "small",
-                "priority": "medium",
-                "risk_level": "low",
-                "confidence": 1.5,  # Invalid: > 1.0
-                "branch_name": "test/confidence-bounds-1",
-            },
-            {
-                "id": "pr_002",
-                "title": "Another PR",
-                "description": "More changes",
-                "files": ["src/test2.py"],
-                "estimated_size": "small",
-                "priority": "medium",
-                "risk_level": "low",
-                "confidence": -0.1,  # Invalid: < 0.0
-                "branch_name": "test/confidence-bounds-2",
-            },
-        ]
-
-        result = await validator_tool.validate_recommendations(confidence_invalid_recs)
-
-        # The validator may not check confidence bounds in the current implementation
-        # Just verify structure
-        for analysis in result["recommendations_analysis"]:
-            assert "valid" in analysis
-            assert "issues" in analysis
-
-    @pytest.mark.asyncio
-    async def test_validate_required_fields(self, validator_tool):
+    async def test_validate_required_fields(self, validator_tool, mock_settings):
         """Test validation of required fields."""
         missing_fields_rec = [
             {
@@ -285,44 +314,9 @@ class TestValidatorTool:
             "files" in issue.lower() or "no files" in issue.lower() for issue in issues
         )
 
-    @pytest.mark.asyncio
-    async def test_validate_enum_values(self, validator_tool):
-        """Test validation of enum field values."""
-        invalid_enum_rec = [
-            {
-                "id": "pr_001",
-                "title": "Test PR",
-                "description": "Test changes",
-                "files": ["src/test.py"],
-                "estimated_size": "invalid_size",  # Not in [small, medium, large]
-                "priority": "invalid_priority",  # Not in [low, medium, high, critical]
-                "risk_level": "invalid_risk",  # Not in [low, medium, high, critical]
-                "confidence": 0.8,
-                "branch_name": "test/enum-validation",
-            }
-        ]
-
-        result = await validator_tool.validate_recommendations(invalid_enum_rec)
-
-        analysis = result["recommendations_analysis"][0]
-
-        # The current validator may not validate enum values strictly
-        # Just verify basic structure validation
-        assert "valid" in analysis
-        assert "issues" in analysis
-
-        # Validator may be lenient about enum values
-        # Just verify structure is correct
-        assert isinstance(analysis["valid"], bool)
-
-    @pytest.mark.asyncio
-    async def test_quality_score_calculation(
-        self, validator_tool, valid_recommendations
-    ):
+    def test_quality_score_calculation(self, valid_result):
         """Test quality score calculation."""
-        result = await validator_tool.validate_recommendations(valid_recommendations)
-
-        quality_score = result["quality_score"]
+        quality_score = valid_result["quality_score"]
 
         # Quality score should be between 0.0 and 10.0
         assert 0.0 <= quality_score <= 10.0